@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 # Resource Assignment Problem using OR-Tools
 
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
+import argparse
+from statistics import mean
+
 from ortools.linear_solver import pywraplp
 
 
@@ -14,11 +14,14 @@ def solve_assignment_problem():
     The goal is to minimize the total cost while ensuring each worker is
     assigned to exactly one task and each task is assigned to exactly one
     worker.
+
+    The LP relaxation of this assignment problem always has an integral
+    optimum, so the LP solver GLOP is used instead of a MIP solver.
     """
     # Create the solver
-    solver = pywraplp.Solver.CreateSolver('SCIP')
+    solver = pywraplp.Solver.CreateSolver('GLOP')
     if not solver:
-        print('Could not create solver SCIP')
+        print('Could not create solver GLOP')
         return
 
     # Problem data
@@ -35,10 +38,11 @@ def solve_assignment_problem():
 
     # Create variables
     # x[i][j] is 1 if worker i is assigned to task j, 0 otherwise
-    x = {}
-    for i in range(num_workers):
-        for j in range(num_tasks):
-            x[i, j] = solver.BoolVar(f'x_{i}_{j}')
+    x = {
+        (i, j): solver.NumVar(0, 1, f'x_{i}_{j}')
+        for i in range(num_workers)
+        for j in range(num_tasks)
+    }
 
     # Add constraints
     # Each worker is assigned to exactly one task
@@ -50,11 +54,9 @@ def solve_assignment_problem():
         solver.Add(solver.Sum([x[i, j] for i in range(num_workers)]) == 1)
 
     # Set objective: minimize total cost
-    objective = solver.Objective()
-    for i in range(num_workers):
-        for j in range(num_tasks):
-            objective.SetCoefficient(x[i, j], costs[i][j])
-    objective.SetMinimization()
+    solver.Minimize(
+        solver.Sum([x[i, j] * costs[i][j] for (i, j) in x])
+    )
 
     # Solve the problem
     status = solver.Solve()
@@ -79,15 +81,14 @@ def visualize_solution(solver, x, costs, status):
     if status != pywraplp.Solver.OPTIMAL:
         return
 
+    # Imported here so that solving without visualization does not pay for
+    # the matplotlib import
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Rectangle
+
     num_workers = 4
     num_tasks = 4
-
-    # Create assignment matrix
-    assignment = np.zeros((num_workers, num_tasks))
-    for i in range(num_workers):
-        for j in range(num_tasks):
-            if x[i, j].solution_value() > 0.5:
-                assignment[i, j] = 1
+    mean_cost = mean(cost for row in costs for cost in row)
 
     # Create the plot
     plt.figure(figsize=(10, 8))
@@ -99,7 +100,7 @@ def visualize_solution(solver, x, costs, status):
     # Add text annotations for costs
     for i in range(num_workers):
         for j in range(num_tasks):
-            color = 'white' if costs[i][j] > np.mean(costs) else 'black'
+            color = 'white' if costs[i][j] > mean_cost else 'black'
             plt.text(
                 j, i, f'{costs[i][j]}',
                 ha='center', va='center', color=color
@@ -108,7 +109,7 @@ def visualize_solution(solver, x, costs, status):
     # Highlight the assignments
     for i in range(num_workers):
         for j in range(num_tasks):
-            if assignment[i, j] == 1:
+            if x[i, j].solution_value() > 0.5:
                 plt.gca().add_patch(
                     Rectangle(
                         (j-0.5, i-0.5), 1, 1,
@@ -128,9 +129,17 @@ def visualize_solution(solver, x, costs, status):
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Solve a resource assignment problem.')
+    parser.add_argument(
+        '--visualize', action='store_true',
+        help='show the solution as a heatmap (requires matplotlib)'
+    )
+    args = parser.parse_args()
+
     result = solve_assignment_problem()
     if result is not None:
-        solver, x, costs, status = result
-        visualize_solution(solver, x, costs, status)
+        if args.visualize:
+            solver, x, costs, status = result
+            visualize_solution(solver, x, costs, status)
     else:
         print("Failed to create solver")
@@ -1,7 +1,83 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from .. import json_utils
 from ..resource_planning_service import ResourcePlanningService
 
+
+class JSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that parses and serializes with orjson when it is installed.
+    
+    The output matches Flask's compact default (sorted keys, ',' and ':'
+    separators), as used by jsonify. Any other formatting, e.g. the indented
+    output in debug mode, is left to the standard library.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        # jsonify only passes the compact separators, which orjson produces as well
+        compact = kwargs.keys() <= {'separators'} and kwargs.get('separators') in (None, (',', ':'))
+        if json_utils.orjson is None or not compact or not self.sort_keys:
+            return super().dumps(obj, **kwargs)
+        return json_utils.dumps_canonical(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if json_utils.orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return json_utils.loads(s)
+
+
 app = Flask(__name__)
+app.json = JSONProvider(app)
+
+# Maximum number of problems solved in one /solve-batch request
+MAX_BATCH_SIZE = 10
+
+def _create_service(data):
+    """
+    Create the planning service for a request body.
+    
+    Args:
+        data: Either {"config_name": "..."} or a complete configuration
+        
+    Returns:
+        ResourcePlanningService set up for the requested problem
+    """
+    # Check if a configuration name was provided
+    if "config_name" in data:
+        return ResourcePlanningService(data["config_name"])
+    
+    # Use the provided configuration directly
+    return ResourcePlanningService(data)
+
+def _apply_field_projection(result, fields):
+    """
+    Drop unrequested keys from the assignments of a solve result.
+    
+    Args:
+        result: Result of ResourcePlanningService.solve()
+        fields: Comma-separated assignment keys to keep (e.g. "date,duty_code,employee_name").
+            Employee keys (employee_id, employee_name) select the keys of the nested employees.
+            
+    Returns:
+        The result with projected assignments, or the unchanged result if fields is empty
+    """
+    if not fields:
+        return result
+    
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    employee_fields = requested & {"employee_id", "employee_name"}
+    
+    assignments = []
+    for assignment in result["assignments"]:
+        projected = {key: value for key, value in assignment.items() if key in requested}
+        if employee_fields:
+            projected["employees"] = [
+                {key: value for key, value in emp.items() if key in employee_fields}
+                for emp in assignment["employees"]
+            ]
+        assignments.append(projected)
+    
+    return {**result, "assignments": assignments}
 
 @app.route('/api/resource-planner/solve', methods=['POST'])
 def solve_resource_planning():
@@ -12,6 +88,9 @@ def solve_resource_planning():
     1. A configuration name in the request body: {"config_name": "oge"}
     2. A complete configuration JSON in the request body
     
+    The optional query parameter "fields" limits the keys returned per assignment,
+    e.g. ?fields=date,duty_code,start_time,end_time,employee_id,employee_name
+    
     Returns:
         JSON response containing:
         - date: The date when solving started
@@ -24,21 +103,52 @@ def solve_resource_planning():
     try:
         data = request.get_json()
         
-        if not data:
+        if not data or not isinstance(data, dict):
             return jsonify({"error": "No data provided"}), 400
         
-        # Check if a configuration name was provided
-        if "config_name" in data:
-            config_name = data["config_name"]
-            service = ResourcePlanningService(config_name)
-        else:
-            # Use the provided configuration directly
-            service = ResourcePlanningService(data)
-        
         # Solve the planning problem
-        result = service.solve()
+        result = _create_service(data).solve()
         
-        return jsonify(result)
+        return jsonify(_apply_field_projection(result, request.args.get("fields")))
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/resource-planner/solve-batch', methods=['POST'])
+def solve_resource_planning_batch():
+    """
+    Endpoint to solve several resource planning problems in one request.
+    
+    Accepts a list of at most MAX_BATCH_SIZE problems in the request body: {"configs": [...]}
+    Each entry is either {"config_name": "oge"} or a complete configuration JSON.
+    The optional query parameter "fields" works as for the /solve endpoint.
+    
+    Returns:
+        JSON with a "results" list in the same order as the request. Each entry
+        is either the result of the /solve endpoint or {"error": "..."} if that
+        problem is not a JSON object or could not be solved.
+    """
+    try:
+        data = request.get_json()
+        
+        if not isinstance(data, dict) or not isinstance(data.get("configs"), list):
+            return jsonify({"error": "No configurations provided"}), 400
+        
+        if len(data["configs"]) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"At most {MAX_BATCH_SIZE} configurations per batch"}), 400
+        
+        fields = request.args.get("fields")
+        results = []
+        for config in data["configs"]:
+            if not isinstance(config, dict):
+                results.append({"error": "Configuration must be a JSON object"})
+                continue
+            try:
+                results.append(_apply_field_projection(_create_service(config).solve(), fields))
+            except Exception as e:
+                results.append({"error": str(e)})
+        
+        return jsonify({"results": results})
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -48,12 +158,17 @@ def list_configurations():
     """
     Endpoint to list all available configurations.
     
+    Supports conditional requests: the response carries an ETag, and a request
+    with a matching If-None-Match header gets a 304 Not Modified without a body.
+    
     Returns:
         JSON with a list of configuration names
     """
     try:
         configs = ResourcePlanningService.list_available_configurations()
-        return jsonify({"configurations": configs})
+        response = jsonify({"configurations": sorted(configs)})
+        response.add_etag()
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -70,7 +185,7 @@ def validate_configuration():
     try:
         data = request.get_json()
         
-        if not data:
+        if not data or not isinstance(data, dict):
             return jsonify({"error": "No configuration provided"}), 400
         
         validation_result = ResourcePlanningService.validate_configuration(data)
@@ -1,7 +1,8 @@
-import json
 import os
 from typing import Dict, List, Any
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from itertools import product
+from . import json_utils
 
 DEFAULT_CONFIG_DIR = os.path.abspath(os.path.join(
     os.path.dirname(__file__), 
@@ -29,8 +30,12 @@ class ConfigLoader:
         Returns:
             List of names of available configurations
         """
-        config_files = [f for f in os.listdir(self.config_dir) if f.endswith('.json')]
-        return [os.path.splitext(f)[0] for f in config_files]
+        with os.scandir(self.config_dir) as entries:
+            return [
+                entry.name[:-len('.json')]
+                for entry in entries
+                if entry.name.endswith('.json') and entry.is_file()
+            ]
     
     def load_configuration_by_name(self, config_name: str) -> Dict[str, Any]:
         """
@@ -51,20 +56,26 @@ class ConfigLoader:
         if not os.path.exists(config_path):
             raise FileNotFoundError(f"Configuration file {config_path} not found")
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-                    
+        config = json_utils.load_file(config_path)
+        
         # Expand duties for each day in the date range
         config["duties"] = self._expand_duties(config)
-                
+        
         return config
 
-    def validate_configuration(self, config: Dict[str, Any]) -> None:
+    def validate_configuration(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validates a configuration.
         
+        Dates without zero padding (e.g. "2025-6-1") are accepted. The returned copy
+        has them in ISO format (YYYY-MM-DD), which is what the constraints expect,
+        and only keeps the off days within the planning period.
+        
         Args:
-            config: Dictionary with the configuration
+            config: Dictionary with the configuration, left unchanged
+            
+        Returns:
+            Normalized copy of the configuration
             
         Raises:
             ValueError: If the configuration is invalid
@@ -75,21 +86,37 @@ class ConfigLoader:
             if key not in config:
                 raise ValueError(f"Configuration must contain the key '{key}'")
         
+        # Normalize a copy, so the caller's configuration is left unchanged
+        config = {
+            **config,
+            "employees": [dict(emp) for emp in config["employees"]],
+            "duties": [dict(duty) for duty in config["duties"]],
+        }
+        
         # Validate date formats and range
         try:
-            start_date = datetime.strptime(config["start_date"], "%Y-%m-%d")
-            end_date = datetime.strptime(config["end_date"], "%Y-%m-%d")
-            if end_date < start_date:
+            start_day = self._parse_date(config["start_date"])
+            end_day = self._parse_date(config["end_date"])
+            if end_day < start_day:
                 raise ValueError("end_date must be after start_date")
         except ValueError:
             raise ValueError("Invalid date format in start_date or end_date")
+        config["start_date"] = start_day.isoformat()
+        config["end_date"] = end_day.isoformat()
+        
+        # All dates of the planning period, so dates can be checked without parsing them
+        num_days = (end_day - start_day).days + 1
+        valid_dates = frozenset(
+            (start_day + timedelta(days=i)).isoformat() for i in range(num_days)
+        )
+        required_emp_keys = ["id", "name", "max_days_in_a_row", "off_days", 
+                             "max_hours_per_day", "max_hours_in_period", "work_percentage"]
+        required_duty_keys = ["id", "code", "date", "start_time", "end_time", "working_minutes"]
         
         # Validate employees
         employee_ids = set()
         for emp in config["employees"]:
             # Check required employee fields
-            required_emp_keys = ["id", "name", "max_days_in_a_row", "off_days", 
-                               "max_hours_per_day", "max_hours_in_period", "work_percentage"]
             for key in required_emp_keys:
                 if key not in emp:
                     raise ValueError(f"Employee must contain the key '{key}'")
@@ -106,12 +133,15 @@ class ConfigLoader:
             # Filter and validate off days
             valid_off_days = []
             for off_day in emp["off_days"]:
+                if off_day in valid_dates:
+                    valid_off_days.append(off_day)
+                    continue
                 try:
-                    off_date = datetime.strptime(off_day, "%Y-%m-%d").date()
-                    if start_date.date() <= off_date <= end_date.date():
-                        valid_off_days.append(off_day)
+                    off_date = self._parse_date(off_day)
                 except ValueError:
                     raise ValueError(f"Invalid date format in off_days: {off_day}")
+                if start_day <= off_date <= end_day:
+                    valid_off_days.append(off_date.isoformat())
             emp["off_days"] = valid_off_days
             
             # Validate numeric fields
@@ -129,9 +159,10 @@ class ConfigLoader:
         
         # Validate Duties
         duty_ids = set()
+        # Expanded duties repeat the same few times, so each time string is checked once
+        valid_times = set()
         for duty in config["duties"]:
             # Check required duty fields
-            required_duty_keys = ["id", "code", "date", "start_time", "end_time", "working_minutes"]
             for key in required_duty_keys:
                 if key not in duty:
                     raise ValueError(f"Duty must contain the key '{key}'")
@@ -142,21 +173,56 @@ class ConfigLoader:
             duty_ids.add(duty["id"])
             
             # Validate date format and range
-            try:
-                duty_date = datetime.strptime(duty["date"], "%Y-%m-%d").date()
-                if not (start_date.date() <= duty_date <= end_date.date()):
+            if duty["date"] not in valid_dates:
+                try:
+                    duty_date = self._parse_date(duty["date"])
+                except ValueError:
+                    raise ValueError(f"Invalid date format in duty: {duty['date']}")
+                if not (start_day <= duty_date <= end_day):
                     raise ValueError(f"Duty date {duty['date']} is outside the configured period")
-            except ValueError:
-                raise ValueError(f"Invalid date format in duty: {duty['date']}")
+                duty["date"] = duty_date.isoformat()
             
             # Validate time formats
-            if not self._validate_time_format(duty["start_time"]) or not self._validate_time_format(duty["end_time"]):
-                raise ValueError(f"Invalid time format in duty: {duty['start_time']} or {duty['end_time']}")
+            for time_str in (duty["start_time"], duty["end_time"]):
+                if time_str in valid_times:
+                    continue
+                if not self._validate_time_format(time_str):
+                    raise ValueError(f"Invalid time format in duty: {duty['start_time']} or {duty['end_time']}")
+                valid_times.add(time_str)
             
             # Validate working_minutes
             if not isinstance(duty["working_minutes"], int) or duty["working_minutes"] <= 0:
                 raise ValueError(f"working_minutes must be a positive integer, got {duty['working_minutes']}")
+        
+        return config
 
+    def _parse_date(self, date_str: str) -> date:
+        """
+        Parses a date string in format "YYYY-MM-DD".
+        
+        Like strptime with "%Y-%m-%d", month and day may also have a single
+        digit (e.g. "2025-6-1"). Other ISO forms like "20250601" are rejected.
+        
+        Args:
+            date_str: Date string to parse
+            
+        Returns:
+            The parsed date
+            
+        Raises:
+            ValueError: If the string is not a valid date
+        """
+        parts = date_str.split("-") if isinstance(date_str, str) else []
+        if (
+            len(parts) != 3
+            or len(parts[0]) != 4
+            or not all(1 <= len(part) <= 2 for part in parts[1:])
+            or not all(part.isascii() and part.isdigit() for part in parts)
+        ):
+            raise ValueError(f"Invalid date: {date_str}")
+        year, month, day = map(int, parts)
+        return date(year, month, day)
+    
     def _calculate_working_minutes(self, start_time: str, end_time: str) -> int:
         """
         Calculates the working minutes for a duty, handling overnight shifts.
@@ -168,54 +234,69 @@ class ConfigLoader:
         Returns:
             Number of working minutes as an integer
         """
-        # Parse times
-        start = datetime.strptime(start_time, "%H:%M")
-        end = datetime.strptime(end_time, "%H:%M")
+        start = self._time_to_minutes(start_time)
+        end = self._time_to_minutes(end_time)
         
-        # Calculate time difference
-        if end < start:
-            # Overnight shift
-            end = end.replace(day=2)  # Add a day to end time
-            start = start.replace(day=1)
+        # Overnight shift: the end time is on the next day
+        return end - start + (1440 if end < start else 0)
+    
+    def _time_to_minutes(self, time_str: str) -> int:
+        """
+        Converts a time string to minutes since midnight.
         
-        # Calculate minutes
-        delta = end - start
-        return int(delta.total_seconds() / 60)  # Convert to minutes
+        Args:
+            time_str: Time in format "HH:MM" or "H:MM"
+            
+        Returns:
+            Minutes since midnight as an integer
+        """
+        hours, minutes = time_str.split(":")
+        return int(hours) * 60 + int(minutes)
     
     def _expand_duties(self, config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Expands duties for each day in the date range.
         
+        Duties are ordered by date and start time and numbered in that order.
+        
         Args:
             config: Dictionary with the configuration
             
         Returns:
             List of expanded duties with dates and IDs
         """
-        start_date = datetime.strptime(config["start_date"], "%Y-%m-%d").date()
-        end_date = datetime.strptime(config["end_date"], "%Y-%m-%d").date()
+        start_date = self._parse_date(config["start_date"])
+        end_date = self._parse_date(config["end_date"])
         
-        expanded_duties = []
-        duty_id = 0
+        # Working minutes only depend on the template, not on the date. The
+        # templates are ordered by start time (then length), so duty IDs follow
+        # the time line of each day rather than the template order.
+        templates = sorted(
+            (
+                (template, self._calculate_working_minutes(template["start_time"], template["end_time"]))
+                for template in config["duties"]
+            ),
+            key=lambda item: (self._time_to_minutes(item[0]["start_time"]), item[1])
+        )
         
-        # Iterate through each day in the date range
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            # Create a duty for each template duty
-            for duty_template in config["duties"]:
-                duty = duty_template.copy()
-                duty["date"] = date_str
-                duty["id"] = duty_id
-                duty["working_minutes"] = self._calculate_working_minutes(
-                    duty["start_time"], 
-                    duty["end_time"]
-                )
-                duty_id += 1
-                expanded_duties.append(duty)
-            
-            current_date += timedelta(days=1)
+        # Build the date strings for the whole range once
+        dates = [
+            date.fromordinal(ordinal).isoformat()
+            for ordinal in range(start_date.toordinal(), end_date.toordinal() + 1)
+        ]
+        
+        # Create a duty for each template duty on each day, numbered in that order
+        expanded_duties = [
+            {
+                **duty_template,
+                "date": date_str,
+                "id": duty_id,
+                "working_minutes": working_minutes,
+            }
+            for duty_id, (date_str, (duty_template, working_minutes)) in enumerate(
+                product(dates, templates)
+            )
+        ]
         
         return expanded_duties
     
@@ -229,14 +310,10 @@ class ConfigLoader:
         Returns:
             True if the format is valid, False otherwise
         """
-        try:
-            # Try parsing with leading zero format
-            datetime.strptime(time_str, "%H:%M")
-            return True
-        except ValueError:
-            try:
-                # Try parsing without leading zero format
-                datetime.strptime(time_str, "%I:%M")
-                return True
-            except ValueError:
-                return False
+        hours, separator, minutes = time_str.partition(":")
+        return (
+            separator == ":"
+            and 1 <= len(hours) <= 2 and hours.isascii() and hours.isdigit()
+            and 1 <= len(minutes) <= 2 and minutes.isascii() and minutes.isdigit()
+            and int(hours) <= 23 and int(minutes) <= 59
+        )
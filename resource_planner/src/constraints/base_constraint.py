@@ -1,7 +1,37 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property, lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
 from ortools.sat.python import cp_model
 
+MINUTES_PER_DAY = 24 * 60
+
+
+@lru_cache(maxsize=4096)
+def _date_ordinal(date_str: str) -> int:
+    """Proleptic Gregorian ordinal of a "YYYY-MM-DD" date, cached across constraints."""
+    return date.fromisoformat(date_str).toordinal()
+
+
+@dataclass(frozen=True)
+class AssignmentColumns:
+    """
+    Assignments as parallel arrays, with one entry per (assignment, assigned employee).
+
+    Times are minutes since 0001-01-01 00:00. Overnight duties end on the next day.
+    """
+
+    employee_ids: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+
+    @property
+    def durations(self) -> np.ndarray:
+        """Duration of each entry in minutes."""
+        return self.ends - self.starts
+
 
 class BaseConstraint(ABC):
     """
@@ -12,6 +42,10 @@ class BaseConstraint(ABC):
     2. validate() - Validates that a solution satisfies the constraint
     """
 
+    # Employee fields that apply() and validate() read, besides the ID. Employees that
+    # agree on these fields for all constraints are interchangeable; None means unknown.
+    employee_fields: Optional[Tuple[str, ...]] = None
+
     def __init__(
         self,
         model: cp_model.CpModel,
@@ -32,6 +66,10 @@ class BaseConstraint(ABC):
         self.assignments = assignments
         self.employees = employees
         self.duties = duties
+        # Shared (employee_id, date) -> "works on this date" variables, set by the planner
+        self.day_work: Dict[Tuple[int, str], Any] = {}
+        # Constant 0 the planner uses for the fixed_assignments() of all constraints
+        self.fixed_zero: Any = None
 
     @abstractmethod
     def apply(self) -> None:
@@ -42,6 +80,14 @@ class BaseConstraint(ABC):
         """
         pass
 
+    def fixed_assignments(self) -> List[Tuple[int, int]]:
+        """
+        (employee_id, duty_id) pairs this constraint forces to 0.
+
+        The planner uses a constant for these pairs instead of creating a variable.
+        """
+        return []
+
     @abstractmethod
     def validate(self, assignments: List[Dict[str, Any]]) -> bool:
         """
@@ -55,6 +101,134 @@ class BaseConstraint(ABC):
         """
         pass
 
+    @cached_property
+    def duties_by_date(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Index of duties grouped by their date, built once per constraint.
+        The planner replaces it with its own index, shared by all constraints.
+
+        Returns:
+            Dictionary mapping dates (YYYY-MM-DD) to the duties on that date
+        """
+        duties_by_date: Dict[str, List[Dict[str, Any]]] = {}
+        for duty in self.duties:
+            duties_by_date.setdefault(duty["date"], []).append(duty)
+        return duties_by_date
+
+    @cached_property
+    def _employees_by_id(self) -> Dict[int, Dict[str, Any]]:
+        """Index of employees by their ID."""
+        return {emp["id"]: emp for emp in self.employees}
+
+    @cached_property
+    def _duties_by_id(self) -> Dict[int, Dict[str, Any]]:
+        """Index of duties by their ID."""
+        return {duty["id"]: duty for duty in self.duties}
+
+    def get_day_work(self, employee_id: int, date: str) -> Any:
+        """
+        Helper method to get the variable telling whether an employee works on a date.
+
+        The variables are created on first use and kept in the dictionary the planner
+        shares with all constraints, so models whose constraints never ask for them
+        don't get them.
+
+        Args:
+            employee_id: ID of the employee
+            date: Date in format "YYYY-MM-DD"
+
+        Returns:
+            Boolean solver variable that is true if the employee works any duty on the date
+        """
+        key = (employee_id, date)
+        if key not in self.day_work:
+            day_var = self.model.NewBoolVar(f'day_work_{employee_id}_{date}')
+            self.model.AddMaxEquality(
+                day_var,
+                [self.assignments[employee_id, duty['id']] for duty in self.duties_by_date.get(date, [])]
+            )
+            self.day_work[key] = day_var
+        return self.day_work[key]
+
+    def _index_assignments_by_employee(
+        self, assignments: List[Dict[str, Any]]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Group assignments by employee ID.
+
+        The index is rebuilt on every call, so it always reflects the current
+        contents of the list.
+
+        Args:
+            assignments: List of assignment dictionaries from the solver
+
+        Returns:
+            Dictionary mapping employee IDs to their assignments
+        """
+        index: Dict[int, List[Dict[str, Any]]] = {}
+        for assignment in assignments:
+            if not isinstance(assignment, dict) or "employees" not in assignment:
+                continue
+            for employee_id in {emp["employee_id"] for emp in assignment["employees"]}:
+                index.setdefault(employee_id, []).append(assignment)
+        return index
+
+    def _to_minutes(self, date_str: str, time_str: str) -> int:
+        """
+        Convert date and time strings to minutes since 0001-01-01 00:00.
+
+        The formats are fixed ("YYYY-MM-DD" and "H:MM"/"HH:MM"), so the time is split
+        directly instead of going through strptime.
+        """
+        hours, _, minutes = time_str.partition(":")
+        return _date_ordinal(date_str) * MINUTES_PER_DAY + int(hours) * 60 + int(minutes)
+
+    def _duty_minutes(self, date_str: str, start_time: str, end_time: str) -> Tuple[int, int]:
+        """
+        Calculate start and end of a duty in minutes since 0001-01-01 00:00.
+
+        If the end time is earlier than the start time, the duty ends on the next day.
+        """
+        start = self._to_minutes(date_str, start_time)
+        end = self._to_minutes(date_str, end_time)
+        if end < start:
+            end += MINUTES_PER_DAY
+        return start, end
+
+    def _get_assignment_columns(self, assignments: List[Dict[str, Any]]) -> AssignmentColumns:
+        """
+        Convert assignments to parallel arrays.
+
+        Date and time strings are parsed once per distinct (date, start, end).
+
+        Args:
+            assignments: List of assignment dictionaries from the solver
+
+        Returns:
+            AssignmentColumns with one entry per (assignment, assigned employee)
+        """
+        duty_minutes: Dict[Tuple[str, str, str], Tuple[int, int]] = {}
+        employee_ids = []
+        starts = []
+        ends = []
+        for assignment in assignments:
+            if not isinstance(assignment, dict) or "employees" not in assignment:
+                continue
+            key = (assignment["date"], assignment["start_time"], assignment["end_time"])
+            if key not in duty_minutes:
+                duty_minutes[key] = self._duty_minutes(*key)
+            start, end = duty_minutes[key]
+            for employee_id in {emp["employee_id"] for emp in assignment["employees"]}:
+                employee_ids.append(employee_id)
+                starts.append(start)
+                ends.append(end)
+
+        return AssignmentColumns(
+            employee_ids=np.array(employee_ids, dtype=np.int64),
+            starts=np.array(starts, dtype=np.int64),
+            ends=np.array(ends, dtype=np.int64),
+        )
+
     def get_employee_assignments(
         self, assignments: List[Dict[str, Any]], employee_id: int
     ) -> List[Dict[str, Any]]:
@@ -68,7 +242,7 @@ class BaseConstraint(ABC):
         Returns:
             List of assignments for this employee
         """
-        if not any(emp["id"] == employee_id for emp in self.employees):
+        if employee_id not in self._employees_by_id:
             return []
 
         # Return all assignments for this employee
@@ -88,7 +262,7 @@ class BaseConstraint(ABC):
         Returns:
             Duty dictionary or None if not found
         """
-        return next((duty for duty in self.duties if duty["id"] == duty_id), None)
+        return self._duties_by_id.get(duty_id)
 
     def get_employee_by_id(self, employee_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -100,4 +274,4 @@ class BaseConstraint(ABC):
         Returns:
             Employee dictionary or None if not found
         """
-        return next((emp for emp in self.employees if emp["id"] == employee_id), None)
+        return self._employees_by_id.get(employee_id)
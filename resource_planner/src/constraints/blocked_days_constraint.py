@@ -1,4 +1,5 @@
-from typing import Dict, List, Any
+from functools import cached_property
+from typing import Dict, FrozenSet, List, Any, Tuple
 from .base_constraint import BaseConstraint
 
 class BlockedDaysConstraint(BaseConstraint):
@@ -6,18 +7,42 @@ class BlockedDaysConstraint(BaseConstraint):
     Constraint ensuring employees are not assigned to duties on their blocked days.
     """
     
+    employee_fields = ("blocked_days",)
+    
+    @cached_property
+    def _blocked_days_by_employee(self) -> Dict[int, FrozenSet[str]]:
+        """Blocked dates of each employee by employee ID, built once per constraint."""
+        return {emp['id']: frozenset(emp['blocked_days']) for emp in self.employees}
+    
+    def fixed_assignments(self) -> List[Tuple[int, int]]:
+        """
+        (employee_id, duty_id) pairs of the duties on each employee's blocked days.
+        
+        Only the duties on the employee's blocked days are visited.
+        """
+        duties_by_date = self.duties_by_date
+        return [
+            (emp_id, duty['id'])
+            for emp_id, blocked_days in self._blocked_days_by_employee.items()
+            for date in blocked_days
+            for duty in duties_by_date.get(date, ())
+        ]
+    
     def apply(self) -> None:
         """
         Apply the blocked days constraint to the model.
         
         For each employee and each duty on a blocked day, the assignment must be 0.
+        The planner already uses a constant 0 for these assignments, so only
+        remaining variables are constrained, with one AddBoolAnd per employee.
         """
-        [
-            self.model.Add(self.assignments[emp['id'], duty['id']] == 0)
-            for emp in self.employees
-            for duty in self.duties
-            if duty['date'] in set(emp['blocked_days'])
-        ]
+        blocked_literals: Dict[int, List[Any]] = {}
+        for emp_id, duty_id in self.fixed_assignments():
+            var = self.assignments[emp_id, duty_id]
+            if var is not self.fixed_zero:
+                blocked_literals.setdefault(emp_id, []).append(var.Not())
+        for literals in blocked_literals.values():
+            self.model.AddBoolAnd(literals)
     
     def validate(self, assignments: List[Dict[str, Any]]) -> bool:
         """
@@ -29,8 +54,13 @@ class BlockedDaysConstraint(BaseConstraint):
         Returns:
             True if no employee is assigned on blocked days, False otherwise
         """
-        return not any(
-            assignment['date'] in set(emp['blocked_days'])
-            for emp in self.employees
-            for assignment in self.get_employee_assignments(assignments, emp['id'])
-        ) 
\ No newline at end of file
+        blocked_days = self._blocked_days_by_employee
+        
+        # Single pass over the assignments
+        for assignment in assignments:
+            date = assignment['date']
+            for employee in assignment.get('employees', ()):
+                employee_blocked_days = blocked_days.get(employee['employee_id'])
+                if employee_blocked_days is not None and date in employee_blocked_days:
+                    return False
+        return True
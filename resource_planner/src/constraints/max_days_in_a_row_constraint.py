@@ -1,5 +1,7 @@
+from functools import cached_property
 from typing import Dict, List, Any
-from datetime import datetime
+import numpy as np
+from ortools.sat.python import cp_model
 from .base_constraint import BaseConstraint
 
 class MaxDaysInARowConstraint(BaseConstraint):
@@ -7,47 +9,55 @@ class MaxDaysInARowConstraint(BaseConstraint):
     Constraint ensuring employees don't work more than the maximum allowed days in a row.
     """
     
+    employee_fields = ("max_days_in_a_row",)
+    
+    @cached_property
+    def _dates_sorted(self) -> List[str]:
+        """All duty dates in order."""
+        return sorted(self.duties_by_date)
+    
+    @cached_property
+    def _date_idx(self) -> Dict[str, int]:
+        """Position of each date in _dates_sorted."""
+        return {date: index for index, date in enumerate(self._dates_sorted)}
+    
     def apply(self) -> None:
         """
         Apply the max days in a row constraint to the model.
         
         For each employee and each window of max_days_in_a_row + 1 consecutive days,
         ensure the employee doesn't work more than max_days_in_a_row days in that window.
+        
+        The windows are sliding sums over the shared daily work variables of the employee.
         """
-        # Get all unique dates and sort them
-        dates_sorted = sorted(set(duty['date'] for duty in self.duties))
+        dates_sorted = self._dates_sorted
         
         for emp in self.employees:
+            emp_id = emp['id']
             max_days = emp['max_days_in_a_row']
+            day_work = [self.get_day_work(emp_id, date) for date in dates_sorted]
             
             # For each window of max_days + 1 consecutive days
             for i in range(len(dates_sorted) - max_days + 1):
-                window = dates_sorted[i:i + max_days + 1]  # +1 to check one more day
-                
-                # For each day in the window, check if the employee works on that day
-                day_assignments = []
-                for date in window:
-                    # Find all duties on this date
-                    day_duties = [d['id'] for d in self.duties if d['date'] == date]
-                    
-                    # Sum of assignments for this employee on this date
-                    day_sum = sum(self.assignments[emp['id'], duty_id] for duty_id in day_duties)
-                    day_assignments.append(day_sum)
+                window = day_work[i:i + max_days + 1]  # +1 to check one more day
                 
                 # Ensure no more than max_days_in_a_row consecutive days are worked
-                self.model.Add(sum(day_assignments) <= max_days)
+                self.model.Add(cp_model.LinearExpr.Sum(window) <= max_days)
     
-    def _get_assignments_by_date(self, assignments: List[Dict[str, Any]]) -> Dict[datetime, List[Dict[str, Any]]]:
-        """Group assignments by date."""
-        assignments_by_date = {}
+    def _get_worked_days(self, assignments: List[Dict[str, Any]]) -> np.ndarray:
+        """Mark the dates (by index in _dates_sorted) that have assignments."""
+        worked_days = np.zeros(len(self._dates_sorted), dtype=np.int64)
         for assignment in assignments:
-            date = assignment['date']
-            assignments_by_date.setdefault(date, []).append(assignment)
-        return assignments_by_date
+            index = self._date_idx.get(assignment['date'])
+            if index is not None:
+                worked_days[index] = 1
+        return worked_days
 
-    def _count_days_worked_in_window(self, window: List[datetime], assignments_by_date: Dict[datetime, List[Dict[str, Any]]]) -> int:
-        """Count how many days in the window have assignments."""
-        return sum(1 for date in window if date in assignments_by_date and assignments_by_date[date])
+    def _count_days_worked_in_windows(self, worked_days: np.ndarray, window_size: int) -> np.ndarray:
+        """Count how many days have assignments in each window of window_size consecutive dates."""
+        cumulative = np.concatenate(([0], np.cumsum(worked_days)))
+        window_ends = np.minimum(np.arange(len(worked_days)) + window_size, len(worked_days))
+        return cumulative[window_ends] - cumulative[:-1]
 
     def validate(self, solution: List[Dict[str, Any]]) -> bool:
         """
@@ -59,17 +69,15 @@ class MaxDaysInARowConstraint(BaseConstraint):
         Returns:
             True if no employee works more than max_days_in_a_row in a row, False otherwise
         """
-        dates_sorted = sorted(set(duty['date'] for duty in self.duties))
+        assignments_by_employee = self._index_assignments_by_employee(solution)
         
         for emp in self.employees:
             max_days = emp['max_days_in_a_row']
-            emp_assignments = self.get_employee_assignments(solution, emp['id'])
-            assignments_by_date = self._get_assignments_by_date(emp_assignments)
+            emp_assignments = assignments_by_employee.get(emp['id'], [])
+            worked_days = self._get_worked_days(emp_assignments)
             
             # Check each window of max_days + 1 consecutive days
-            windows = (dates_sorted[i:i + max_days + 1] for i in range(len(dates_sorted) - max_days + 1))
-            
-            if any(self._count_days_worked_in_window(window, assignments_by_date) > max_days for window in windows):
+            if np.any(self._count_days_worked_in_windows(worked_days, max_days + 1) > max_days):
                 return False
                 
         return True 
\ No newline at end of file
@@ -1,4 +1,7 @@
+from functools import cached_property
 from typing import Dict, List, Any
+import numpy as np
+from ortools.sat.python import cp_model
 from .base_constraint import BaseConstraint
 
 class MaxWorkingHoursInPeriodConstraints(BaseConstraint):
@@ -6,18 +9,22 @@ class MaxWorkingHoursInPeriodConstraints(BaseConstraint):
     Constraint ensuring employees don't work more than their maximum allowed working hours.
     """
     
+    employee_fields = ("max_hours_in_period",)
+    
     def apply(self) -> None:
         """
         Apply the max working hours constraint to the model.
         
         For each employee ensure that the sum of their working hours is less than max_working_hours_in_period.
         """
+        duty_minutes = [duty['working_minutes'] for duty in self.duties]
+        
         for emp in self.employees:
-            # Calculate total working minutes by summing up the product of each assignment variable
-            # with its corresponding duty's working minutes
-            total_minutes = sum(
-                self.assignments[emp['id'], duty['id']] * duty['working_minutes']
-                for duty in self.duties
+            # Calculate total working minutes as the weighted sum of the assignment variables
+            # with their corresponding duty's working minutes
+            total_minutes = cp_model.LinearExpr.WeightedSum(
+                [self.assignments[emp['id'], duty['id']] for duty in self.duties],
+                duty_minutes
             )
             
             # Convert max hours to minutes and ensure total minutes doesn't exceed maximum
@@ -34,19 +41,31 @@ class MaxWorkingHoursInPeriodConstraints(BaseConstraint):
         Returns:
             True if no employee exceeds their maximum working minutes, False otherwise
         """
-        for emp in self.employees:
-            # Get all assignments for this employee
-            emp_assignments = self.get_employee_assignments(assignments, emp['id'])
-            
-            # Sum up working minutes for all assigned duties
-            total_minutes = sum(
-                duty['working_minutes']
-                for assignment in emp_assignments
-                if (duty := self.get_duty_by_id(assignment['duty_id'])) is not None
-            )
-            
-            # Check if total hours exceed maximum
-            if total_minutes / 60 > emp['max_hours_in_period']:
-                return False
-                
-        return True 
\ No newline at end of file
+        # One entry per (assignment, assigned employee)
+        emp_indices = []
+        emp_minutes = []
+        for assignment in assignments:
+            duty = self.get_duty_by_id(assignment['duty_id'])
+            if duty is None:
+                continue
+            for employee_id in {employee['employee_id'] for employee in assignment['employees']}:
+                index = self._employee_index.get(employee_id)
+                if index is not None:
+                    emp_indices.append(index)
+                    emp_minutes.append(duty['working_minutes'])
+        
+        # Sum up working minutes per employee and compare with their maximum
+        total_minutes = np.bincount(
+            np.asarray(emp_indices, dtype=np.int64),
+            weights=np.asarray(emp_minutes, dtype=float),
+            minlength=len(self.employees)
+        )
+        max_minutes = np.array(
+            [int(emp['max_hours_in_period']) * 60 for emp in self.employees], dtype=float
+        )
+        return bool(np.all(total_minutes <= max_minutes))
+    
+    @cached_property
+    def _employee_index(self) -> Dict[int, int]:
+        """Position of each employee ID in self.employees."""
+        return {emp['id']: index for index, emp in enumerate(self.employees)}
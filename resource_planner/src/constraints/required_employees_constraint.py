@@ -1,5 +1,6 @@
 from typing import Dict, List, Any
 from collections import defaultdict
+from ortools.sat.python import cp_model
 from .base_constraint import BaseConstraint
 
 class RequiredEmployeesConstraint(BaseConstraint):
@@ -7,6 +8,8 @@ class RequiredEmployeesConstraint(BaseConstraint):
     Constraint ensuring each duty has the required number of employees assigned.
     """
     
+    employee_fields = ()
+    
     def apply(self) -> None:
         """
         Apply the required employees constraint to the model.
@@ -16,15 +19,16 @@ class RequiredEmployeesConstraint(BaseConstraint):
         for duty in self.duties:
             required = duty['required_employees']
             # Sum of all employee assignments for this duty must equal required_employees
-            emp_sum = sum(self.assignments[emp['id'], duty['id']] 
-                         for emp in self.employees)
+            emp_sum = cp_model.LinearExpr.Sum(
+                [self.assignments[emp['id'], duty['id']] for emp in self.employees]
+            )
             self.model.Add(emp_sum == required)
     
     def _count_assignments_per_duty(self, assignments: List[Dict[str, Any]]) -> Dict[str, int]:
         """Count how many employees are assigned to each duty."""
         duty_counts = defaultdict(int)
         for assignment in assignments:
-            duty_counts[assignment['duty_id']] = len(assignment['employees'])
+            duty_counts[assignment['duty_id']] += len(assignment['employees'])
         return duty_counts
     
     def validate(self, assignments: List[Dict[str, Any]]) -> bool:
@@ -41,7 +45,7 @@ class RequiredEmployeesConstraint(BaseConstraint):
         
         # Only check duties that are in the assignments
         return all(
-            duty_counts.get(duty['id'], 0) == duty['required_employees']
+            duty_counts[duty['id']] == duty['required_employees']
             for duty in self.duties
-            if any(assignment['duty_id'] == duty['id'] for assignment in assignments)
+            if duty['id'] in duty_counts
         ) 
\ No newline at end of file
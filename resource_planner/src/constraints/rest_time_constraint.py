@@ -1,6 +1,6 @@
-from typing import Dict, List, Any
-from datetime import datetime, timedelta
-from .base_constraint import BaseConstraint
+from typing import Dict, List, Any, Tuple
+import numpy as np
+from .base_constraint import BaseConstraint, MINUTES_PER_DAY
 
 class RestTimeConstraint(BaseConstraint):
     """
@@ -10,7 +10,9 @@ class RestTimeConstraint(BaseConstraint):
     of rest between consecutive duties, taking into account both dates and times.
     """
     
-    def __init__(self, model, assignments, employees, duties, min_rest_hours=8):
+    employee_fields = ()
+    
+    def __init__(self, model, assignments, employees, duties, min_rest_hours=8, skip_same_day_pairs=False):
         """
         Initialize the rest time constraint.
         
@@ -20,36 +22,38 @@ class RestTimeConstraint(BaseConstraint):
             employees: List of employee dictionaries
             duties: List of duty dictionaries
             min_rest_hours: Minimum required rest time in hours (default: 8)
+            skip_same_day_pairs: Don't post pairs of duties starting on the same date,
+                for models where OneDutyPerDayConstraint already forbids them (default: False)
         """
         super().__init__(model, assignments, employees, duties)
         self.min_rest_minutes = min_rest_hours * 60  # Convert to minutes
-        self._duty_times = self._calculate_duty_times()
-    
-    def _parse_datetime(self, date_str: str, time_str: str) -> datetime:
-        """Parse date and time strings to datetime object."""
-        return datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+        self.skip_same_day_pairs = skip_same_day_pairs
+        # Duty IDs with their start and end times as parallel arrays
+        self._duty_ids, self._duty_starts, self._duty_ends = self._calculate_duty_times()
     
-    def _calculate_duty_times(self) -> Dict[str, Dict[str, datetime]]:
-        """Calculate start and end times for all duties."""
-        duty_times = {}
+    def _calculate_duty_times(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate start and end times for all duties.
+        
+        Returns:
+            Tuple of arrays (duty_ids, starts, ends) in the order of self.duties,
+            with the times in minutes since 0001-01-01 00:00
+        """
+        duty_ids = []
+        starts = []
+        ends = []
         for duty in self.duties:
-            # Parse start time with date
-            start = self._parse_datetime(duty['date'], duty['start_time'])
-            
-            # Parse end time with date
-            end = self._parse_datetime(duty['date'], duty['end_time'])
-            
-            # Handle overnight duties (end time is on next day)
-            if end < start:
-                end = end + timedelta(days=1)
-                
-            duty_times[int(duty['id'])] = {
-                'start': start,
-                'end': end
-            }
-        return duty_times
+            start, end = self._duty_minutes(duty['date'], duty['start_time'], duty['end_time'])
+            duty_ids.append(int(duty['id']))
+            starts.append(start)
+            ends.append(end)
+        return (
+            np.array(duty_ids, dtype=np.int64),
+            np.array(starts, dtype=np.int64),
+            np.array(ends, dtype=np.int64)
+        )
     
-    def _get_rest_minutes(self, end_time: datetime, start_time: datetime) -> int:
+    def _get_rest_minutes(self, end_minutes: int, start_minutes: int) -> int:
         """
         Calculate rest time in minutes between two duties.
         
@@ -58,7 +62,46 @@ class RestTimeConstraint(BaseConstraint):
         - Duty2 starts on 2025-01-02 02:00
         - Rest time would be 3 hours (180 minutes)
         """
-        return int((start_time - end_time).total_seconds() / 60)
+        return start_minutes - end_minutes
+    
+    def _find_conflicting_duty_pairs(self) -> List[Tuple[int, int]]:
+        """
+        Find all duty pairs with less than min_rest_minutes between them.
+        
+        Duties are sorted by start time once. For every duty, the range of duties
+        starting within min_rest_minutes after its end is found by binary search,
+        for all duties at once.
+        
+        If skip_same_day_pairs is set, pairs of duties starting on the same date are left out.
+        
+        Returns:
+            List of (duty_id1, duty_id2) pairs where duty2 starts less than
+            min_rest_minutes (but more than 0 minutes) after duty1 ends
+        """
+        order = np.argsort(self._duty_starts, kind='stable')
+        sorted_starts = self._duty_starts[order]
+        
+        # [first, last) range of duties starting after duty1 ends but before it has rested enough
+        first = np.searchsorted(sorted_starts, self._duty_ends, side='right')
+        last = np.searchsorted(
+            sorted_starts,
+            self._duty_ends + self.min_rest_minutes,
+            side='left'
+        )
+        
+        # Date of each duty, as days since 0001-01-01
+        duty_days = self._duty_starts // MINUTES_PER_DAY
+        
+        conflicting_pairs = []
+        for index1 in np.flatnonzero(first < last):
+            duty_id1 = int(self._duty_ids[index1])
+            for index2 in order[first[index1]:last[index1]]:
+                if index2 == index1:
+                    continue
+                if self.skip_same_day_pairs and duty_days[index2] == duty_days[index1]:
+                    continue
+                conflicting_pairs.append((duty_id1, int(self._duty_ids[index2])))
+        return conflicting_pairs
     
     def apply(self) -> None:
         """
@@ -66,28 +109,21 @@ class RestTimeConstraint(BaseConstraint):
         
         For each employee and each pair of duties, if the time between the end
         of one duty and the start of another is less than min_rest_minutes,
-        the employee cannot be assigned to both duties.
+        the employee cannot be assigned to both duties. Each pair is posted as
+        the clause "not duty1 or not duty2".
         """
+        # Duty times don't depend on the employee, so find the conflicting pairs once
+        conflicting_pairs = self._find_conflicting_duty_pairs()
+        
+        assignments = self.assignments
+        add_bool_or = self.model.AddBoolOr
         for emp in self.employees:
-            for duty1 in self.duties:
-                for duty2 in self.duties:
-                    if duty1['id'] == duty2['id']:
-                        continue
-                        
-                    end1 = self._duty_times[duty1['id']]['end']
-                    start2 = self._duty_times[duty2['id']]['start']
-                    
-                    # Calculate minutes between end of duty1 and start of duty2
-                    diff_minutes = self._get_rest_minutes(end1, start2)
-                    
-                    # If less than min_rest_minutes between duties, add constraint
-                    if 0 < diff_minutes < self.min_rest_minutes:
-                        key1 = f"{emp['id']}_{duty1['id']}"
-                        key2 = f"{emp['id']}_{duty2['id']}"
-                        self.model.Add(
-                            self.assignments[key1] + 
-                            self.assignments[key2] <= 1
-                        )
+            emp_id = emp['id']
+            for duty_id1, duty_id2 in conflicting_pairs:
+                add_bool_or([
+                    assignments[emp_id, duty_id1].Not(),
+                    assignments[emp_id, duty_id2].Not()
+                ])
     
     def validate(self, assignments: List[Dict[str, Any]]) -> bool:
         """
@@ -99,25 +135,21 @@ class RestTimeConstraint(BaseConstraint):
         Returns:
             True if all employees have sufficient rest time, False otherwise
         """
-        for emp in self.employees:
-            emp_assignments = self.get_employee_assignments(assignments, emp['id'])
-            
-            # Sort assignments by start time
-            sorted_assignments = sorted(
-                emp_assignments,
-                key=lambda x: self._parse_datetime(x['date'], x['start_time'])
-            )
-            
-            # Check rest time between consecutive assignments
-            for i in range(len(sorted_assignments) - 1):
-                current = sorted_assignments[i]
-                next_duty = sorted_assignments[i + 1]
-                
-                end_time = self._parse_datetime(current['date'], current['end_time'])
-                start_time = self._parse_datetime(next_duty['date'], next_duty['start_time'])
-                
-                rest_minutes = self._get_rest_minutes(end_time, start_time)
-                if rest_minutes < self.min_rest_minutes:
-                    return False
-                    
-        return True 
\ No newline at end of file
+        columns = self._get_assignment_columns(assignments)
+        
+        # Only the employees of this constraint are checked
+        known = np.isin(columns.employee_ids, [emp['id'] for emp in self.employees])
+        employee_ids = columns.employee_ids[known]
+        starts = columns.starts[known]
+        ends = columns.ends[known]
+        
+        # Sort by employee, then by start (and end) time
+        order = np.lexsort((ends, starts, employee_ids))
+        employee_ids = employee_ids[order]
+        starts = starts[order]
+        ends = ends[order]
+        
+        # Check rest time between consecutive assignments of the same employee
+        same_employee = employee_ids[1:] == employee_ids[:-1]
+        rest_minutes = self._get_rest_minutes(ends[:-1], starts[1:])
+        return not bool(np.any(same_employee & (rest_minutes < self.min_rest_minutes)))
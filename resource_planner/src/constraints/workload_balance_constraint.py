@@ -1,7 +1,7 @@
 from typing import Dict, List, Any
-from collections import defaultdict
+import numpy as np
+from ortools.sat.python import cp_model
 from .base_constraint import BaseConstraint
-from datetime import datetime, timedelta
 
 class WorkloadBalanceConstraint(BaseConstraint):
     """
@@ -15,6 +15,8 @@ class WorkloadBalanceConstraint(BaseConstraint):
     division more precisely in the CP-SAT solver.
     """
     
+    employee_fields = ("max_hours_in_period",)
+    
     def __init__(self, model, assignments, employees, duties, max_deviation_percent=20):
         """
         Initialize the workload balance constraint.
@@ -30,18 +32,38 @@ class WorkloadBalanceConstraint(BaseConstraint):
         self.max_deviation_percent = max_deviation_percent
         self.emp_utilizations = {}  # Maps employee_id to their utilization variable (0-100 scale)
     
+    def _add_floor_division(self, quotient, numerator, denominator: int) -> None:
+        """
+        Constrain quotient == numerator // denominator for a positive constant denominator.
+        
+        Equivalent to AddDivisionEquality, but expressed as two linear constraints:
+        quotient * denominator <= numerator <= quotient * denominator + denominator - 1
+        
+        Args:
+            quotient: Variable receiving the result of the division
+            numerator: Non-negative linear expression to divide
+            denominator: Positive integer constant
+        """
+        self.model.Add(quotient * denominator <= numerator)
+        self.model.Add(numerator <= quotient * denominator + denominator - 1)
+    
     def _calculate_workloads(self) -> Dict[str, Any]:
         """
         Calculate workloads and utilizations for all employees.
         
         Creates CP-SAT variables for:
         - Total minutes worked by each employee
-        - Utilization percentage for each employee (0-100 scale)
+        - Utilization percentage for each employee (0-100 scale), unless all employees
+          have the same max_hours_in_period
         
         Returns:
             Dictionary containing workload and utilization variables
         """
         emp_workload_minutes = {}
+        # Working minutes of each duty, used as coefficients for every employee
+        duty_minutes = [duty['working_minutes'] for duty in self.duties]
+        # With a single shared cap, utilization is the same scale of minutes for everyone
+        uniform_capacity = len({emp['max_hours_in_period'] for emp in self.employees}) == 1
         
         for emp in self.employees:
             # Create variable for total minutes worked by this employee
@@ -52,13 +74,15 @@ class WorkloadBalanceConstraint(BaseConstraint):
             )
             
             # Sum up minutes from all duties
-            duty_minutes = []
-            for duty in self.duties:
-                minutes = duty['working_minutes']
-                duty_minutes.append(minutes * self.assignments[emp['id'], duty['id']])
+            duty_vars = [self.assignments[emp['id'], duty['id']] for duty in self.duties]
             
             # Add constraint for total minutes
-            self.model.Add(emp_workload_minutes[emp['id']] == sum(duty_minutes))
+            self.model.Add(
+                emp_workload_minutes[emp['id']] == cp_model.LinearExpr.WeightedSum(duty_vars, duty_minutes)
+            )
+            
+            if uniform_capacity:
+                continue
             
             # Create utilization variable (0-100 scale)
             self.emp_utilizations[emp['id']] = self.model.NewIntVar(
@@ -66,18 +90,70 @@ class WorkloadBalanceConstraint(BaseConstraint):
                 f'utilization_percent_{emp["id"]}'
             )
             
-            # Add division constraint for utilization percentage
-            self.model.AddDivisionEquality(
+            # utilization = workload_minutes * 100 // max_possible_minutes, posted as two
+            # linear bounds instead of an AddDivisionEquality
+            self._add_floor_division(
                 self.emp_utilizations[emp['id']],
-                emp_workload_minutes[emp['id']],
+                emp_workload_minutes[emp['id']] * 100,
                 max_possible_minutes
             )
         
         return {
             'emp_workloads': emp_workload_minutes,
-            'emp_utilizations': self.emp_utilizations
+            'emp_utilizations': self.emp_utilizations,
+            'uniform_capacity': uniform_capacity
         }
     
+    def _add_max_abs_deviation(self, deviations: Dict[int, Any], upper_bound: int) -> Any:
+        """
+        Create a variable equal to the largest absolute deviation.
+        
+        Each employee's absolute deviation gets its own variable (AddAbsEquality),
+        and their maximum is posted with a single AddMaxEquality.
+        
+        Args:
+            deviations: Dictionary mapping employee IDs to their deviation expressions
+            upper_bound: Upper bound of the absolute deviations
+            
+        Returns:
+            Variable holding the maximum absolute deviation
+        """
+        abs_deviations = []
+        for emp_id, deviation in deviations.items():
+            abs_deviation = self.model.NewIntVar(0, upper_bound, f'abs_deviation_{emp_id}')
+            self.model.AddAbsEquality(abs_deviation, deviation)
+            abs_deviations.append(abs_deviation)
+        
+        max_abs_deviation = self.model.NewIntVar(0, upper_bound, 'max_abs_scaled_deviation')
+        self.model.AddMaxEquality(max_abs_deviation, abs_deviations)
+        return max_abs_deviation
+    
+    def _minimize_workload_minutes_deviation(self, emp_workload_minutes: Dict[int, Any]) -> None:
+        """
+        Minimize the maximum deviation of worked minutes from the average.
+        
+        Used when all employees have the same max_hours_in_period, so balancing
+        minutes is equivalent to balancing utilization. The average is kept exact by
+        comparing num_employees * minutes with the total instead of dividing.
+        
+        Args:
+            emp_workload_minutes: Dictionary mapping employee IDs to their minutes variables
+        """
+        num_employees = len(self.employees)
+        max_possible_minutes = self.employees[0]['max_hours_in_period'] * 60
+        total_minutes = cp_model.LinearExpr.Sum(list(emp_workload_minutes.values()))
+        
+        # Maximum absolute deviation, scaled by the number of employees
+        max_abs_scaled_deviation = self._add_max_abs_deviation(
+            {
+                emp_id: minutes_var * num_employees - total_minutes
+                for emp_id, minutes_var in emp_workload_minutes.items()
+            },
+            num_employees * max_possible_minutes
+        )
+        
+        self.model.Minimize(max_abs_scaled_deviation)
+    
     def apply(self) -> None:
         """
         Apply the workload balance constraint to the model.
@@ -88,10 +164,16 @@ class WorkloadBalanceConstraint(BaseConstraint):
         3. Ensures each employee's utilization stays within the allowed deviation
            from the average
         
+        If all employees have the same max_hours_in_period, the worked minutes are
+        balanced directly, without utilization variables and divisions.
+        
         The calculations use a scaled approach (multiplied by 1000) to handle
         integer division more precisely, especially for small denominators.
         """
         workloads = self._calculate_workloads()
+        if workloads['uniform_capacity']:
+            self._minimize_workload_minutes_deviation(workloads['emp_workloads'])
+            return
         
         # Scale factor to avoid integer division issues
         # Using 1000 to ensure good precision with small denominators
@@ -103,26 +185,13 @@ class WorkloadBalanceConstraint(BaseConstraint):
             'avg_utilization_scaled'
         )
         
-        # Create variable for total utilization (scaled)
-        # Each utilization in self.emp_utilizations.values() is 0-100.
-        # We scale each by SCALE before summing, or sum then scale. Summing then scaling is fine.
-        total_scaled_utilization_sum = self.model.NewIntVar(
-            0, 100 * len(self.employees) * SCALE, 
-            'total_utilization_sum_scaled'
-        )
-        
-        # Sum of (utilization_var * SCALE) for all employees
-        # Or, sum(utilization_var) then multiply result by SCALE
-        # The original approach sums IntVar objects then multiplies the sum expression by SCALE.
-        # This is usually supported by CP-SAT for linear expressions.
-        self.model.Add(total_scaled_utilization_sum == sum(self.emp_utilizations.values()) * SCALE)
-        
         # Add constraint for average utilization
-        # self.avg_utilization = total_scaled_utilization_sum / len(self.employees)
-        # Using scaled values to maintain precision with small denominators
-        self.model.AddDivisionEquality(
+        # self.avg_utilization = sum(utilizations) * SCALE / len(self.employees)
+        # Using scaled values to maintain precision with small denominators.
+        # The scaled sum is used as an expression, without an auxiliary variable.
+        self._add_floor_division(
             self.avg_utilization,
-            total_scaled_utilization_sum, # This is already scaled sum of utilizations
+            cp_model.LinearExpr.Sum(list(self.emp_utilizations.values())) * SCALE,
             len(self.employees) # Denominator is number of employees
         )
         
@@ -132,30 +201,16 @@ class WorkloadBalanceConstraint(BaseConstraint):
         # Define a variable for the maximum absolute deviation (scaled).
         # This will be the objective to minimize.
         # The maximum possible deviation is 100% (e.g., avg 0%, emp 100%), scaled by SCALE.
-        max_abs_scaled_deviation = self.model.NewIntVar(
-            0, 100 * SCALE, 
-            'max_abs_scaled_deviation'
+        # utilization_var is in the range [0, 100], so it is scaled up to match
+        # the scale of self.avg_utilization.
+        max_abs_scaled_deviation = self._add_max_abs_deviation(
+            {
+                emp_id: utilization_var * SCALE - self.avg_utilization
+                for emp_id, utilization_var in self.emp_utilizations.items()
+            },
+            100 * SCALE
         )
 
-        # For each employee, ensure their scaled deviation from the scaled average
-        # is less than or equal to max_abs_scaled_deviation.
-        for emp_id, utilization_var in self.emp_utilizations.items():
-            # utilization_var is in the range [0, 100].
-            # Scale it up to match the scale of self.avg_utilization.
-            emp_scaled_utilization = self.model.NewIntVar(
-                0, 100 * SCALE, 
-                f'utilization_scaled_{emp_id}' # Reuses name from the removed block, which is fine.
-            )
-            self.model.Add(emp_scaled_utilization == utilization_var * SCALE)
-            
-            # Add constraints for: max_abs_scaled_deviation >= abs(emp_scaled_utilization - self.avg_utilization)
-            # This is equivalent to:
-            # max_abs_scaled_deviation >= emp_scaled_utilization - self.avg_utilization AND
-            # max_abs_scaled_deviation >= -(emp_scaled_utilization - self.avg_utilization)
-            
-            self.model.Add(max_abs_scaled_deviation >= emp_scaled_utilization - self.avg_utilization)
-            self.model.Add(max_abs_scaled_deviation >= self.avg_utilization - emp_scaled_utilization)
-
         # Minimize this maximum absolute deviation.
         # This makes the workload balance a soft constraint: the solver will try to make
         # max_abs_scaled_deviation as small as possible, ideally zero, but will accept
@@ -172,56 +227,19 @@ class WorkloadBalanceConstraint(BaseConstraint):
         Returns:
             True if workloads are balanced, False otherwise
         """
-        # Calculate workload for each employee
-        emp_workloads = defaultdict(int)
-        
-        # Sum up minutes for each employee based on assignments
-        for assignment in assignments:
-            # Calculate minutes from start and end time
-            start_time = datetime.strptime(assignment['start_time'], "%H:%M")
-            end_time = datetime.strptime(assignment['end_time'], "%H:%M")
-            
-            # If end time is earlier than start time, it's an overnight duty
-            if end_time < start_time:
-                end_time = end_time + timedelta(days=1)
-            
-            minutes = int((end_time - start_time).total_seconds() / 60)
-            
-            for employee in assignment['employees']:
-                emp_id = employee['employee_id']
-                emp_workloads[emp_id] += minutes
+        columns = self._get_assignment_columns(assignments)
+        if len(columns.employee_ids) == 0:
+            return True
         
-        # Calculate average workload
-        total_workload = sum(emp_workloads.values())
-        avg_workload = total_workload / len(emp_workloads) if emp_workloads else 0
+        # Sum up minutes for each employee
+        _, emp_index = np.unique(columns.employee_ids, return_inverse=True)
+        emp_workloads = np.bincount(emp_index, weights=columns.durations.astype(float))
         
         # Check if any employee's workload deviates too much from the average
+        avg_workload = emp_workloads.mean()
         if avg_workload == 0:
             return True
             
-        return all(
-            abs(workload - avg_workload) / avg_workload * 100 <= self.max_deviation_percent
-            for workload in emp_workloads.values()
-        )
-    
-    def _calculate_duty_hours(self, start_time: str, end_time: str) -> float:
-        """
-        Calculate the number of hours for a duty, handling overnight duties correctly.
-        
-        Args:
-            start_time: Start time in format "HH:MM"
-            end_time: End time in format "HH:MM"
-            
-        Returns:
-            Number of hours the duty lasts
-        """
-        start = datetime.strptime(start_time, "%H:%M")
-        end = datetime.strptime(end_time, "%H:%M")
-        
-        # If end time is earlier than start time, it's an overnight duty
-        if end < start:
-            # Add 24 hours to the end time to get the correct duration
-            end = end + timedelta(days=1)
-        
-        duration = end - start
-        return duration.total_seconds() / 3600 
\ No newline at end of file
+        return bool(np.all(
+            np.abs(emp_workloads - avg_workload) / avg_workload * 100 <= self.max_deviation_percent
+        ))
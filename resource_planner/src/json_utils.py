@@ -0,0 +1,90 @@
+"""
+JSON helpers for the Resource Planner.
+
+Uses orjson when it is installed and falls back to the standard library otherwise.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def loads(data: bytes) -> Any:
+    """
+    Deserializes a JSON document.
+    
+    Args:
+        data: UTF-8 encoded JSON document
+        
+    Returns:
+        The deserialized Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: str) -> Any:
+    """
+    Loads a JSON document from a file.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        The deserialized Python object
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """
+    Serializes an object to an indented JSON document.
+    
+    Args:
+        obj: JSON-serializable object
+        
+    Returns:
+        UTF-8 encoded JSON document, indented by two spaces
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def dumps_canonical(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serializes an object to a compact JSON document with sorted keys.
+    
+    Equal objects always give the same bytes, so the result can be hashed.
+    
+    Args:
+        obj: JSON-serializable object
+        default: Optional function returning a serializable version of unsupported objects
+        
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        obj, default=default, sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    ).encode('utf-8')
+
+
+def dump_file(obj: Any, path: str) -> None:
+    """
+    Writes an object to a file as an indented JSON document.
+    
+    Args:
+        obj: JSON-serializable object
+        path: Path of the file to write
+    """
+    data = dumps_pretty(obj)
+    with open(path, 'wb') as f:
+        f.write(data)
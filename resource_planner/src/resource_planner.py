@@ -1,11 +1,71 @@
+from contextlib import contextmanager
 from ortools.sat.python import cp_model
-from typing import List, Type, Dict, Tuple, Any
+from types import MappingProxyType
+from typing import List, Optional, Type, Dict, Tuple, Any
 from enum import Enum
+import os
+import threading
 
 from .constraints import (
     BaseConstraint,
 )
 
+# Number of CP-SAT search workers per solve: one per core, or 8 if the count is unknown
+NUM_SEARCH_WORKERS = os.cpu_count() or 8
+
+# Upper bounds that time_limit and workers are capped to
+MAX_TIME_LIMIT_SECONDS = 300.0
+MAX_SEARCH_WORKERS = os.cpu_count() or 1
+
+# Solve options, the CP-SAT parameters they set and the values they accept
+SOLVE_OPTION_PARAMETERS = {
+    "time_limit": ("max_time_in_seconds", lambda value: _is_number(value) and value > 0),
+    "workers": ("num_search_workers", lambda value: _is_int(value) and value > 0),
+    "log": ("log_search_progress", lambda value: isinstance(value, bool)),
+    "linearization_level": ("linearization_level", lambda value: _is_int(value) and 0 <= value <= 2),
+    "relative_gap_limit": ("relative_gap_limit", lambda value: _is_number(value) and 0 <= value <= 1),
+}
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _SolverSlots:
+    """
+    Budget of CPU cores for the CP-SAT workers of all solves in this process.
+    
+    Each solve reserves one slot per search worker (at most all slots) and waits
+    until enough slots are free, so concurrent solves don't oversubscribe the cores.
+    Solves with few workers can run side by side.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.available = capacity
+        self._condition = threading.Condition()
+    
+    @contextmanager
+    def reserve(self, workers: int):
+        """Hold min(workers, capacity) slots while the block runs; 0 workers means all slots."""
+        slots = min(workers, self.capacity) if workers > 0 else self.capacity
+        with self._condition:
+            self._condition.wait_for(lambda: self.available >= slots)
+            self.available -= slots
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.available += slots
+                self._condition.notify_all()
+
+
+_solver_slots = _SolverSlots(os.cpu_count() or 1)
+
 
 class SolverStatus(Enum):
     """Enum representing the possible statuses of the constraint solver.
@@ -25,21 +85,29 @@ class ResourcePlanner:
     This planner allows adding various constraints to ensure the schedule meets all requirements.
     """
     
-    def __init__(self):
+    def __init__(self, break_symmetry: bool = True):
         """
         Initialize the resource planner with an empty model and data structures.
         
         Args:
-            debug_mode: Whether to enable debugging features
-            log_file: Path to log file for debugging output
+            break_symmetry: Whether setup_model orders the schedules of interchangeable
+                employees (see break_employee_symmetry)
         """
         self.model: cp_model.CpModel = cp_model.CpModel()
         self.solver_assignments: Dict[Tuple[int, int], Any] = {}  # For solver variables
+        self.day_work: Dict[Tuple[int, str], Any] = {}  # Employee works on date, created on demand by constraints
+        self.fixed_zero = self.model.NewConstant(0)  # Used for assignments fixed to 0 by constraints
         self.result_assignments: List[Dict[str, Any]] = []  # For final results
         self.employees: List[Dict[str, Any]] = []
         self.duties: List[Dict[str, Any]] = []
+        self.duties_by_date: Dict[str, List[Dict[str, Any]]] = {}  # Shared by constraints
         self.calendar_days: set = set()
         self.constraints: List[BaseConstraint] = []
+        # Variable names only help when debugging the model, so they are left out otherwise
+        self.name_variables: bool = os.environ.get("DEBUG_API", "") not in ("", "0")
+        self.frozen: bool = False
+        self.break_symmetry: bool = break_symmetry
+        self.objective_value: Optional[float] = None  # Of the last solution, if the model has an objective
         
     def add_employee(self, id: int, name: str, max_days_in_row: int, 
                     blocked_days: List[str], max_hours_per_day: int,
@@ -55,6 +123,7 @@ class ResourcePlanner:
             max_hours_per_day: Maximum hours the employee can work in a day
             max_hours_in_period: Maximum hours the employee can work in the planning period
         """
+        self._check_not_frozen()
         self.employees.append({
             "id": id,
             "name": name,
@@ -77,6 +146,7 @@ class ResourcePlanner:
             end_time: End time in format "HH:MM"
             working_minutes: Number of minutes the duty lasts
         """
+        self._check_not_frozen()
         duty = {
             "id": id,
             "code": code,
@@ -87,6 +157,7 @@ class ResourcePlanner:
             "working_minutes": working_minutes
         }
         self.duties.append(duty)
+        self.duties_by_date.setdefault(date, []).append(duty)
         
     def add_constraint(self, constraint_class: Type[BaseConstraint], **kwargs) -> None:
         """
@@ -96,7 +167,11 @@ class ResourcePlanner:
             constraint_class: The constraint class to instantiate
             **kwargs: Additional arguments to pass to the constraint constructor
         """
+        self._check_not_frozen()
         constraint = constraint_class(self.model, self.solver_assignments, self.employees, self.duties, **kwargs)
+        constraint.day_work = self.day_work
+        constraint.duties_by_date = self.duties_by_date
+        constraint.fixed_zero = self.fixed_zero
         self.constraints.append(constraint)
         
     def setup_model(self) -> None:
@@ -104,35 +179,174 @@ class ResourcePlanner:
         Initialize the constraint model with all necessary variables and constraints.
         
         This method creates the assignment variables and applies all constraints.
+        Assignments that a constraint fixes to 0 (e.g. on blocked days) get a
+        constant instead of a variable.
         """
+        self._check_not_frozen()
+        fixed = {
+            pair
+            for constraint in self.constraints
+            for pair in constraint.fixed_assignments()
+        }
+        
         # Create assignment variables
-        for emp in self.employees:
-            for duty in self.duties:
-                var_name = f'emp_{emp["id"]}_duty_{duty["id"]}'
-                self.solver_assignments[emp['id'], duty['id']] = self.model.NewBoolVar(var_name)
+        new_bool_var = self.model.NewBoolVar
+        assignments = self.solver_assignments
+        duty_ids = [duty['id'] for duty in self.duties]
+        for emp_id in (emp['id'] for emp in self.employees):
+            for duty_id in duty_ids:
+                if (emp_id, duty_id) in fixed:
+                    assignments[emp_id, duty_id] = self.fixed_zero
+                    continue
+                var_name = f'emp_{emp_id}_duty_{duty_id}' if self.name_variables else ''
+                assignments[emp_id, duty_id] = new_bool_var(var_name)
         
         # Apply all constraints
         for constraint in self.constraints:
             constraint.apply()
         
-    def solve(self) -> SolverStatus:
+        if self.break_symmetry:
+            self.break_employee_symmetry()
+        
+    def break_employee_symmetry(self) -> None:
         """
-        Solve the resource planning problem.
+        Order the schedules of interchangeable employees.
+        
+        Employees that agree on every field the constraints read (their
+        employee_fields) are interchangeable, so any schedule can be rewritten with
+        their duties swapped. A constraint without employee_fields may read any
+        field, so then employees must agree on all fields but ID and name.
+        Within each group of such employees, the duty assignments of each employee
+        (in duty order) must be lexicographically greater or equal to those of the
+        next employee. This keeps the solver from exploring the permutations of the
+        same schedule.
+        """
+        if any(constraint.employee_fields is None for constraint in self.constraints):
+            fields = sorted({field for emp in self.employees for field in emp} - {"id", "name"})
+        else:
+            fields = sorted({field for constraint in self.constraints for field in constraint.employee_fields})
+        
+        groups: Dict[Tuple, List[int]] = {}
+        for emp in self.employees:
+            key = tuple(
+                tuple(sorted(value)) if isinstance(value, list) else value
+                for value in (emp.get(field) for field in fields)
+            )
+            groups.setdefault(key, []).append(emp['id'])
+        
+        duty_ids = [duty['id'] for duty in self.duties]
+        for emp_ids in groups.values():
+            for emp_id1, emp_id2 in zip(emp_ids, emp_ids[1:]):
+                self._add_lex_greater_equal(
+                    [self.solver_assignments[emp_id1, duty_id] for duty_id in duty_ids],
+                    [self.solver_assignments[emp_id2, duty_id] for duty_id in duty_ids]
+                )
+        
+    def _add_lex_greater_equal(self, first: List[Any], second: List[Any]) -> None:
+        """
+        Require the boolean list first to be lexicographically >= second.
+        
+        prefix_equal is a literal that is true whenever all earlier positions
+        are equal; while it is true, first may not be 0 where second is 1.
+        """
+        prefix_equal = None  # None: the empty prefix, which is always equal
+        for index, (a, b) in enumerate(zip(first, second)):
+            guard = [] if prefix_equal is None else [prefix_equal.Not()]
+            # prefix equal => a >= b
+            self.model.AddBoolOr(guard + [a, b.Not()])
+            if index == len(first) - 1:
+                break
+            # prefix equal and a == b => next prefix equal
+            next_equal = self.model.NewBoolVar('')
+            self.model.AddBoolOr(guard + [a.Not(), b.Not(), next_equal])
+            self.model.AddBoolOr(guard + [a, b, next_equal])
+            prefix_equal = next_equal
+        
+    def freeze(self) -> None:
+        """
+        Make the set up planner read-only, so it can be shared between services.
+        
+        Employees, duties and constraints become tuples, and the employee and duty
+        dictionaries and the variable lookups become read-only mappings, also in
+        the constraints. Adding employees, duties or constraints or setting up the
+        model again raises a RuntimeError. The CpModel itself cannot be frozen; after
+        setup_model it is only read by the solvers.
+        """
+        self.employees = tuple(
+            MappingProxyType({**emp, "blocked_days": tuple(emp["blocked_days"])})
+            for emp in self.employees
+        )
+        duties_by_id = {duty['id']: MappingProxyType(dict(duty)) for duty in self.duties}
+        self.duties = tuple(duties_by_id.values())
+        self.duties_by_date = MappingProxyType({
+            date: tuple(duties_by_id[duty['id']] for duty in duties)
+            for date, duties in self.duties_by_date.items()
+        })
+        self.solver_assignments = MappingProxyType(self.solver_assignments)
+        self.day_work = MappingProxyType(self.day_work)
+        self.calendar_days = frozenset(self.calendar_days)
+        self.constraints = tuple(self.constraints)
+        for constraint in self.constraints:
+            constraint.employees = self.employees
+            constraint.duties = self.duties
+            constraint.duties_by_date = self.duties_by_date
+            constraint.assignments = self.solver_assignments
+            constraint.day_work = self.day_work
+        self.frozen = True
+    
+    def _check_not_frozen(self) -> None:
+        """Raise a RuntimeError if the planner was frozen."""
+        if self.frozen:
+            raise RuntimeError("The planner is frozen and cannot be changed")
         
+    def create_solver(self, options: Optional[Dict[str, Any]] = None) -> cp_model.CpSolver:
+        """
+        Create a CP-SAT solver with the default parameters, overridden by options.
+        
+        Args:
+            options: Optional solve options, see SOLVE_OPTION_PARAMETERS
+                (time_limit, workers, log, linearization_level, relative_gap_limit).
+                time_limit and workers are capped to MAX_TIME_LIMIT_SECONDS and MAX_SEARCH_WORKERS.
+            
         Returns:
-            SolverStatus: The status of the solver (OPTIMAL, FEASIBLE, or INFEASIBLE)
+            The configured solver
+            
+        Raises:
+            ValueError: If an option is unknown or its value is invalid
         """
         solver = cp_model.CpSolver()
-        
-        # Set solver parameters to help find solutions
-        #TODO: make this configurable / do we need it?
-        solver.parameters.max_time_in_seconds = 300.0 
-        # Give the solver more time
-        solver.parameters.num_search_workers = 8  # Use multiple workers
-        #solver.parameters.search_branching = cp_model.PORTFOLIO_SEARCH  # Use portfolio search
+        solver.parameters.max_time_in_seconds = 300.0
+        solver.parameters.num_search_workers = NUM_SEARCH_WORKERS
         solver.parameters.random_seed = 42  # Use a fixed seed for reproducibility
         
-        status = solver.Solve(self.model)
+        for option, value in (options or {}).items():
+            if option not in SOLVE_OPTION_PARAMETERS:
+                raise ValueError(f"Unknown solve option: {option}")
+            parameter, is_valid = SOLVE_OPTION_PARAMETERS[option]
+            if not is_valid(value):
+                raise ValueError(f"Invalid value for solve option {option}: {value!r}")
+            if option == "time_limit":
+                value = min(value, MAX_TIME_LIMIT_SECONDS)
+            elif option == "workers":
+                value = min(value, MAX_SEARCH_WORKERS)
+            setattr(solver.parameters, parameter, value)
+        return solver
+        
+    def solve(self, options: Optional[Dict[str, Any]] = None) -> SolverStatus:
+        """
+        Solve the resource planning problem.
+        
+        Args:
+            options: Optional solve options passed to create_solver
+        
+        Returns:
+            SolverStatus: The status of the solver (OPTIMAL, FEASIBLE, or INFEASIBLE)
+        """
+        solver = self.create_solver(options)
+        
+        # Wait for a free slot if other requests are solving at the same time
+        with _solver_slots.reserve(solver.parameters.num_search_workers):
+            status = solver.Solve(self.model)
         
         assignments = []
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
@@ -159,6 +373,11 @@ class ResourcePlanner:
             assignments.sort(key=lambda x: (x['date'], x['duty_code'], x['start_time']))
         
         self.result_assignments = assignments
+        self.objective_value = (
+            solver.ObjectiveValue()
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) and self.model.HasObjective()
+            else None
+        )
         
         # Map OR-Tools status to our SolverStatus enum
         if status == cp_model.OPTIMAL:
@@ -181,11 +400,7 @@ class ResourcePlanner:
         if not self.result_assignments:
             raise ValueError("No valid assignments to validate")
             
-        validation_results = {}
-        
-        for constraint in self.constraints:
-            constraint_name = constraint.__class__.__name__
-            is_valid = constraint.validate(self.result_assignments)
-            validation_results[constraint_name] = is_valid
-            
-        return validation_results
+        return {
+            constraint.__class__.__name__: constraint.validate(self.result_assignments)
+            for constraint in self.constraints
+        }
@@ -1,7 +1,11 @@
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Optional, Union
+from collections import OrderedDict
 from datetime import datetime
-import json
+import copy
+import hashlib
 import os
+import threading
+from . import json_utils
 from .resource_planner import ResourcePlanner
 from .config_loader import ConfigLoader, DEFAULT_CONFIG_DIR
 from .constraints import (
@@ -25,8 +29,23 @@ class ResourcePlanningService:
     The service can be initialized in two ways:
     1. With a configuration name (which gets loaded from the config directory)
     2. With a direct configuration JSON (for API/external calls)
+
+    Set up planners are cached by configuration content, so services created
+    again for the same configuration reuse the built model and constraints.
+    Each service gets a shallow copy of the cached planner with its own results.
+    The CpModel, its variables and the constraints are shared between services,
+    also across threads. Cached planners are frozen (see ResourcePlanner.freeze),
+    so their employees, duties, constraints and variable lookups are read-only.
+    Solving and validating only read the model, and every solve uses its own
+    CpSolver.
     """
 
+    # Maximum number of set up planners kept in the cache
+    PLANNER_CACHE_SIZE = 16
+
+    _planner_cache: "OrderedDict[str, ResourcePlanner]" = OrderedDict()
+    _planner_cache_lock = threading.Lock()
+
     def __init__(
         self,
         config_source: Union[str, Dict[str, Any]],
@@ -51,10 +70,32 @@ class ResourcePlanningService:
             self.config = config_source
             self.config_name = self.config.get("name", "direct_config")
 
-        self.config_loader.validate_configuration(self.config)
-
-        self.planner = ResourcePlanner()
-        self._setup_planner()
+        # Validate first, so the cache key and self.config are always the normalized configuration
+        self.config = self.config_loader.validate_configuration(self.config)
+
+        # Solve options are not part of the model, so they must not split the cache
+        model_config = {key: value for key, value in self.config.items() if key != "solver_options"}
+        cache_key = hashlib.sha1(json_utils.dumps_canonical(model_config)).hexdigest()
+        with self._planner_cache_lock:
+            cached_planner = self._planner_cache.get(cache_key)
+            if cached_planner is not None:
+                self._planner_cache.move_to_end(cache_key)
+
+        if cached_planner is None:
+            self.planner = ResourcePlanner()
+            self._setup_planner()
+            self.planner.freeze()
+            cached_planner = self.planner
+
+            with self._planner_cache_lock:
+                self._planner_cache[cache_key] = cached_planner
+                while len(self._planner_cache) > self.PLANNER_CACHE_SIZE:
+                    self._planner_cache.popitem(last=False)
+
+        # The cached planner is frozen and solving only reads the model (see the
+        # class docstring), so a shallow copy with its own results is enough
+        self.planner = copy.copy(cached_planner)
+        self.planner.result_assignments = []
 
     def _setup_planner(self) -> None:
         """Set up the planner with employees, duties, and constraints from the configuration."""
@@ -86,8 +127,9 @@ class ResourcePlanningService:
         self.planner.add_constraint(BlockedDaysConstraint)
         self.planner.add_constraint(OneDutyPerDayConstraint)
         self.planner.add_constraint(MaxWorkingHoursInPeriodConstraints)
+        # Same-day duty pairs are already excluded by OneDutyPerDayConstraint
         self.planner.add_constraint(
-            RestTimeConstraint, min_rest_hours=12
+            RestTimeConstraint, min_rest_hours=12, skip_same_day_pairs=True
         )  # TODO: make this configurable
         self.planner.add_constraint(MaxDaysInARowConstraint)
         self.planner.add_constraint(WorkloadBalanceConstraint)
@@ -95,9 +137,16 @@ class ResourcePlanningService:
         # Setup the model
         self.planner.setup_model()
 
-    def solve(self) -> Dict[str, Any]:
+    def solve(self, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Solve the planning problem and save input/output to debug files.
+        Solve the planning problem.
+
+        If the DEBUG_API environment variable is set (to anything but "0"), the
+        input configuration and the result are saved to debug files.
+
+        Args:
+            options: Optional solve options passed to ResourcePlanner.create_solver.
+                Set by server-side callers only; never read from the configuration.
 
         Returns:
             Dictionary containing:
@@ -108,24 +157,25 @@ class ResourcePlanningService:
             - status: The solver status (OPTIMAL, FEASIBLE, or INFEASIBLE)
             - assignments: List of solved assignments with duty and employee information
         """
-        # Generate timestamp for filenames
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        debug_enabled = os.environ.get("DEBUG_API", "") not in ("", "0")
+
+        if debug_enabled:
+            # Generate timestamp for filenames
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        # Create debug directory if it doesn't exist
-        current_file_dir = os.path.dirname(__file__)
-        debug_dir = os.path.abspath(os.path.join(current_file_dir, '..', 'data', 'debug'))
-        os.makedirs(debug_dir, exist_ok=True)
+            # Create debug directory if it doesn't exist
+            current_file_dir = os.path.dirname(__file__)
+            debug_dir = os.path.abspath(os.path.join(current_file_dir, '..', 'data', 'debug'))
+            os.makedirs(debug_dir, exist_ok=True)
 
-        # Save input configuration
-        input_filename = f"{debug_dir}/input_{timestamp}.json"
-        with open(input_filename, "w") as f:
-            json.dump(self.config, f, indent=2)
+            # Save input configuration
+            json_utils.dump_file(self.config, f"{debug_dir}/input_{timestamp}.json")
 
         # Record start time
         start_datetime = datetime.now()
 
         # Solve the problem
-        status = self.planner.solve()
+        status = self.planner.solve(options)
         assignments = self.planner.result_assignments
 
         # Record end time
@@ -144,10 +194,9 @@ class ResourcePlanningService:
             "assignments": assignments,
         }
 
-        # Save output assignments
-        output_filename = f"{debug_dir}/output_{timestamp}.json"
-        with open(output_filename, "w") as f:
-            json.dump(result, f, indent=2)
+        if debug_enabled:
+            # Save output assignments
+            json_utils.dump_file(result, f"{debug_dir}/output_{timestamp}.json")
 
         return result
 
@@ -1,9 +1,24 @@
 #!/usr/bin/env python
 """
 Script to run the Resource Planner API server.
+
+Uses the waitress WSGI server when it is installed and falls back to
+Flask's (threaded) development server otherwise.
 """
 
 from .api.resource_planner_api import app
 
+try:
+    from waitress import serve
+except ImportError:  # pragma: no cover - depends on the environment
+    serve = None
+
+HOST = '0.0.0.0'
+PORT = 5000
+THREADS = 8
+
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=5000) 
\ No newline at end of file
+    if serve is not None:
+        serve(app, host=HOST, port=PORT, threads=THREADS)
+    else:
+        app.run(host=HOST, port=PORT, threaded=True)
@@ -1,5 +1,6 @@
 import pytest
 from datetime import datetime, timedelta
+from ortools.sat.python import cp_model
 
 class MockModel:
     """Mock CP-SAT model for testing."""
@@ -12,6 +13,30 @@ def mock_model():
     """Mock CP-SAT model for testing."""
     return MockModel()
 
+@pytest.fixture
+def make_cp_model():
+    """Factory for a real CP-SAT model with one BoolVar per (employee, duty)."""
+    def make(employees, duties):
+        model = cp_model.CpModel()
+        assignments = {
+            (emp["id"], duty["id"]): model.NewBoolVar(f"emp_{emp['id']}_duty_{duty['id']}")
+            for emp in employees
+            for duty in duties
+        }
+        return model, assignments
+    return make
+
+@pytest.fixture
+def is_feasible():
+    """Check whether a CP-SAT model has a solution with the given literals true."""
+    def check(model, literals=()):
+        model.ClearAssumptions()
+        model.AddAssumptions(list(literals))
+        solver = cp_model.CpSolver()
+        solver.parameters.num_search_workers = 1
+        return solver.Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return check
+
 @pytest.fixture
 def mock_assignments():
     """Mock assignments dictionary for testing."""
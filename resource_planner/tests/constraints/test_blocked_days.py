@@ -68,6 +68,33 @@ class TestBlockedDaysConstraint:
             }
         ]
     
+    def test_apply_forbids_only_blocked_duties(self, make_cp_model, is_feasible, employees_with_blocked_days, basic_duties):
+        """Test that apply forbids the duties on blocked days and nothing else."""
+        model, assignments = make_cp_model(employees_with_blocked_days, basic_duties)
+        BlockedDaysConstraint(model, assignments, employees_with_blocked_days, basic_duties).apply()
+        
+        assert not is_feasible(model, [assignments[0, 0]])
+        assert not is_feasible(model, [assignments[1, 3]])
+        assert is_feasible(model, [assignments[0, 2], assignments[1, 0], assignments[2, 1]])
+    
+    def test_fixed_assignments(self, mock_model, mock_assignments, employees_with_blocked_days, basic_duties):
+        """Test that the duties on blocked days are reported as fixed to 0."""
+        constraint = BlockedDaysConstraint(mock_model, mock_assignments, employees_with_blocked_days, basic_duties)
+        assert sorted(constraint.fixed_assignments()) == [(0, 0), (0, 1), (1, 2), (1, 3)]
+    
+    def test_apply_with_fixed_zero(self, make_cp_model, is_feasible, employees_with_blocked_days, basic_duties):
+        """Test that apply accepts assignments the planner already fixed to 0."""
+        model, assignments = make_cp_model(employees_with_blocked_days, basic_duties)
+        constraint = BlockedDaysConstraint(model, assignments, employees_with_blocked_days, basic_duties)
+        constraint.fixed_zero = model.NewConstant(0)
+        for pair in constraint.fixed_assignments():
+            assignments[pair] = constraint.fixed_zero
+        constraint.apply()
+        
+        # Every assignment that is not blocked can still be made
+        free = [var for pair, var in assignments.items() if pair not in constraint.fixed_assignments()]
+        assert is_feasible(model, free)
+    
     def test_valid_assignments(self, mock_model, mock_assignments, employees_with_blocked_days, basic_duties, valid_assignments):
         """Test that valid assignments pass validation."""
         constraint = BlockedDaysConstraint(mock_model, mock_assignments, employees_with_blocked_days, basic_duties)
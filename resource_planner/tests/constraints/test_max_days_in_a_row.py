@@ -104,6 +104,37 @@ class TestMaxDaysInARowConstraint:
             }
         ]
     
+    def test_validate_after_in_place_change(self, mock_model, mock_assignments, basic_employees, basic_duties, valid_assignments):
+        """Test that validation sees assignments added to the same list after an earlier call."""
+        constraint = MaxDaysInARowConstraint(mock_model, mock_assignments, basic_employees, basic_duties)
+        assert constraint.validate(valid_assignments)
+        
+        # Employee 0 now also works May 4, so May 1-7 are 7 days in a row
+        valid_assignments[3]["employees"].append({"employee_id": 0, "employee_name": "Anna Schmidt"})
+        assert not constraint.validate(valid_assignments)
+    
+    def test_employee_assignments_are_a_copy(self, mock_model, mock_assignments, basic_employees, basic_duties, valid_assignments):
+        """Test that the returned list of an employee's assignments can be changed safely."""
+        constraint = MaxDaysInARowConstraint(mock_model, mock_assignments, basic_employees, basic_duties)
+        constraint.get_employee_assignments(valid_assignments, 0).clear()
+        
+        assert len(constraint.get_employee_assignments(valid_assignments, 0)) == 6
+    
+    def test_apply_limits_days_in_a_row(self, make_cp_model, is_feasible, basic_employees, basic_duties):
+        """Test that apply allows 3 days in a row but not 4, on shared daily work variables."""
+        model, assignments = make_cp_model(basic_employees, basic_duties)
+        shared_day_work = {}
+        first = MaxDaysInARowConstraint(model, assignments, basic_employees, basic_duties)
+        second = MaxDaysInARowConstraint(model, assignments, basic_employees, basic_duties)
+        first.day_work = second.day_work = shared_day_work
+        first.apply()
+        second.apply()
+        
+        # One daily variable per employee and date, created only once
+        assert len(shared_day_work) == len(basic_employees) * len(basic_duties)
+        assert not is_feasible(model, [assignments[0, duty_id] for duty_id in range(4)])
+        assert is_feasible(model, [assignments[0, duty_id] for duty_id in (0, 1, 2, 4, 5, 6)])
+    
     def test_valid_assignments(self, mock_model, mock_assignments, basic_employees, basic_duties, valid_assignments):
         """Test that valid assignments pass validation."""
         constraint = MaxDaysInARowConstraint(mock_model, mock_assignments, basic_employees, basic_duties)
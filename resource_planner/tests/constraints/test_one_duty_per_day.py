@@ -66,6 +66,16 @@ class TestOneDutyPerDayConstraint:
             }
         ]
     
+    def test_apply_at_most_one_per_date(self, make_cp_model, is_feasible, basic_employees, basic_duties):
+        """Test that apply forbids two duties on the same date, but not on different dates."""
+        duties = basic_duties[:2] + [{**basic_duties[0], "id": 2, "start_time": "14:00", "end_time": "23:00"}]
+        model, assignments = make_cp_model(basic_employees, duties)
+        OneDutyPerDayConstraint(model, assignments, basic_employees, duties).apply()
+        
+        # Duties 0 and 2 are on the same date
+        assert not is_feasible(model, [assignments[0, 0], assignments[0, 2]])
+        assert is_feasible(model, [assignments[0, 0], assignments[0, 1], assignments[1, 2]])
+    
     def test_valid_assignments(self, mock_model, mock_assignments, basic_employees, basic_duties, valid_assignments):
         """Test that valid assignments pass validation."""
         constraint = OneDutyPerDayConstraint(mock_model, mock_assignments, basic_employees, basic_duties)
@@ -64,6 +64,59 @@ class TestRestTimeConstraint:
             }
         ]
     
+    def test_validate_after_in_place_change(self, mock_model, mock_assignments, basic_employees, basic_duties, valid_assignments):
+        """Test that validation sees duties changed in the same list after an earlier call."""
+        constraint = RestTimeConstraint(mock_model, mock_assignments, basic_employees, basic_duties, min_rest_hours=12)
+        assert constraint.validate(valid_assignments)
+        
+        # Employee 0 now starts 2025-05-02 at 00:00, only 11 hours after the first duty
+        valid_assignments[1]["start_time"] = "00:00"
+        assert not constraint.validate(valid_assignments)
+    
+    def test_apply_forbids_conflicting_pairs(self, make_cp_model, is_feasible, basic_employees):
+        """Test that apply forbids duty pairs with too little rest for every employee."""
+        duties = [
+            {"id": 0, "code": "LATE", "date": "2025-05-01", "start_time": "14:00", "end_time": "23:00", "working_minutes": 540},
+            {"id": 1, "code": "EARLY", "date": "2025-05-02", "start_time": "04:00", "end_time": "13:00", "working_minutes": 540},
+            {"id": 2, "code": "LATE", "date": "2025-05-02", "start_time": "14:00", "end_time": "23:00", "working_minutes": 540}
+        ]
+        model, assignments = make_cp_model(basic_employees, duties)
+        constraint = RestTimeConstraint(model, assignments, basic_employees, duties, min_rest_hours=12)
+        constraint.apply()
+        
+        # LATE -> EARLY (5 hours rest) and EARLY -> LATE (1 hour rest) conflict,
+        # LATE -> LATE (15 hours rest) does not
+        for emp in basic_employees:
+            assert not is_feasible(model, [assignments[emp["id"], 0], assignments[emp["id"], 1]])
+            assert not is_feasible(model, [assignments[emp["id"], 1], assignments[emp["id"], 2]])
+            assert is_feasible(model, [assignments[emp["id"], 0], assignments[emp["id"], 2]])
+        
+        # EARLY -> LATE is on the same date
+        constraint.skip_same_day_pairs = True
+        assert constraint._find_conflicting_duty_pairs() == [(0, 1)]
+    
+    def test_overnight_duty_rest(self, mock_model, mock_assignments, basic_employees, basic_duties):
+        """Test that the rest after an overnight duty is counted from its end on the next day."""
+        assignments = [
+            {
+                "duty_id": 0,
+                "date": "2025-05-01",
+                "start_time": "20:00",
+                "end_time": "04:00",
+                "employees": [{"employee_id": 0, "employee_name": "Anna Schmidt"}]
+            },
+            {
+                "duty_id": 1,
+                "date": "2025-05-02",
+                "start_time": "14:00",
+                "end_time": "22:00",
+                "employees": [{"employee_id": 0, "employee_name": "Anna Schmidt"}]
+            }
+        ]
+        constraint = RestTimeConstraint(mock_model, mock_assignments, basic_employees, basic_duties, min_rest_hours=12)
+        # Only 10 hours between 04:00 and 14:00 on 2025-05-02
+        assert not constraint.validate(assignments)
+    
     def test_valid_assignments(self, mock_model, mock_assignments, basic_employees, basic_duties, valid_assignments):
         """Test that valid assignments pass validation."""
         constraint = RestTimeConstraint(mock_model, mock_assignments, basic_employees, basic_duties, min_rest_hours=12)
@@ -1,5 +1,6 @@
 import pytest
-from resource_planner.src.constraints import WorkloadBalanceConstraint
+from ortools.sat.python import cp_model
+from resource_planner.src.constraints import RequiredEmployeesConstraint, WorkloadBalanceConstraint
 
 class TestWorkloadBalanceConstraint:
     """Tests for WorkloadBalanceConstraint validation."""
@@ -82,6 +83,39 @@ class TestWorkloadBalanceConstraint:
             # Max difference: 24 - 2 = 22 hours (very unbalanced)
         ]
     
+    @pytest.mark.parametrize("caps, expected_utilizations", [
+        ([40, 40, 40, 40], 0),
+        ([40, 40, 32, 40], 4),
+    ])
+    def test_apply_utilizations_only_for_mixed_capacities(self, make_cp_model, basic_employees, basic_duties, caps, expected_utilizations):
+        """Test that utilization variables are only created when max_hours_in_period differ."""
+        employees = [dict(emp, max_hours_in_period=cap) for emp, cap in zip(basic_employees, caps)]
+        model, assignments = make_cp_model(employees, basic_duties)
+        constraint = WorkloadBalanceConstraint(model, assignments, employees, basic_duties)
+        constraint.apply()
+        
+        assert len(constraint.emp_utilizations) == expected_utilizations
+        assert model.HasObjective()
+    
+    def test_uneven_capacities_balance_utilization_percent(self, make_cp_model, basic_employees, basic_duties):
+        """Test that mixed capacities are balanced by utilization percent, not by whole multiples of the cap."""
+        # 10h and 20h caps; three 5h duties that need one employee each
+        employees = [dict(basic_employees[0], max_hours_in_period=10), dict(basic_employees[1], max_hours_in_period=20)]
+        duties = [dict(duty, working_minutes=300, required_employees=1) for duty in basic_duties[:3]]
+        model, assignments = make_cp_model(employees, duties)
+        RequiredEmployeesConstraint(model, assignments, employees, duties).apply()
+        WorkloadBalanceConstraint(model, assignments, employees, duties).apply()
+        
+        solver = cp_model.CpSolver()
+        solver.parameters.num_search_workers = 1
+        assert solver.Solve(model) == cp_model.OPTIMAL
+        
+        # 1 duty for Anna and 2 for Ben is 50% each; with workload // cap (the old
+        # AddDivisionEquality), giving all 3 duties to Ben was just as good
+        num_duties = [sum(solver.Value(assignments[emp["id"], duty["id"]]) for duty in duties) for emp in employees]
+        assert num_duties == [1, 2]
+        assert solver.ObjectiveValue() == 0
+    
     def test_valid_assignments(self, mock_model, mock_assignments, basic_employees, basic_duties, valid_assignments):
         """Test that valid assignments pass validation."""
         constraint = WorkloadBalanceConstraint(mock_model, mock_assignments, basic_employees, basic_duties, max_deviation_percent=20)
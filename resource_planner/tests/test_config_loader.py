@@ -0,0 +1,155 @@
+import pytest
+from resource_planner.src.config_loader import ConfigLoader
+
+class TestConfigLoader:
+    """Tests for ConfigLoader duty expansion."""
+    
+    @pytest.fixture
+    def config(self):
+        """Configuration with two duty templates over three days."""
+        return {
+            "start_date": "2025-05-30",
+            "end_date": "2025-06-01",
+            "duties": [
+                {"code": "DIS", "required_employees": 1, "start_time": "04:00", "end_time": "13:00"},
+                {"code": "NGT", "required_employees": 1, "start_time": "22:00", "end_time": "06:30"}
+            ]
+        }
+    
+    def test_expand_duties(self, config):
+        """Test that each template is expanded for each day with sequential IDs."""
+        duties = ConfigLoader()._expand_duties(config)
+        
+        assert [duty["id"] for duty in duties] == list(range(6))
+        assert [duty["date"] for duty in duties] == [
+            "2025-05-30", "2025-05-30",
+            "2025-05-31", "2025-05-31",
+            "2025-06-01", "2025-06-01"
+        ]
+        assert [duty["code"] for duty in duties[:2]] == ["DIS", "NGT"]
+    
+    def test_expand_duties_working_minutes(self, config):
+        """Test that working minutes are calculated, including overnight duties."""
+        duties = ConfigLoader()._expand_duties(config)
+        
+        assert duties[0]["working_minutes"] == 540
+        assert duties[1]["working_minutes"] == 510
+    
+    def test_expand_duties_ordered_by_start_time(self, config):
+        """Test that duties of a day are numbered by start time, not template order."""
+        config["duties"].reverse()
+        duties = ConfigLoader()._expand_duties(config)
+        
+        assert [duty["code"] for duty in duties[:2]] == ["DIS", "NGT"]
+        assert [duty["id"] for duty in duties] == list(range(6))
+    
+    def test_expand_duties_does_not_modify_templates(self, config):
+        """Test that the duty templates are left untouched."""
+        ConfigLoader()._expand_duties(config)
+        
+        assert "date" not in config["duties"][0]
+        assert "id" not in config["duties"][0]
+    
+    @pytest.mark.parametrize("time_str, expected", [
+        ("04:00", True),
+        ("4:00", True),
+        ("23:59", True),
+        ("24:00", False),
+        ("12:60", False),
+        ("1200", False),
+        ("ab:cd", False),
+        ("12:00:00", False)
+    ])
+    def test_validate_time_format(self, time_str, expected):
+        """Test that time strings are validated without parsing them as datetimes."""
+        assert ConfigLoader()._validate_time_format(time_str) is expected
+    
+    @pytest.fixture
+    def expanded_config(self, config):
+        """Complete configuration with expanded duties and one employee."""
+        config = {
+            "name": "Test",
+            "description": "Test configuration",
+            **config,
+            "employees": [
+                {
+                    "id": 0,
+                    "name": "Anna Schmidt",
+                    "max_days_in_a_row": 3,
+                    "off_days": ["2025-05-29", "2025-05-31", "2025-6-1"],
+                    "max_hours_per_day": 8,
+                    "max_hours_in_period": 40,
+                    "work_percentage": 100
+                }
+            ]
+        }
+        config["duties"] = ConfigLoader()._expand_duties(config)
+        return config
+    
+    def test_validate_configuration_filters_off_days(self, expanded_config):
+        """Test that off days outside the planning period are dropped."""
+        config = ConfigLoader().validate_configuration(expanded_config)
+        
+        assert config["employees"][0]["off_days"] == ["2025-05-31", "2025-06-01"]
+    
+    def test_validate_configuration_normalizes_dates(self, expanded_config):
+        """Test that dates without zero padding are rewritten in ISO format in a copy."""
+        expanded_config["end_date"] = "2025-6-1"
+        expanded_config["duties"][-1]["date"] = "2025-6-1"
+        config = ConfigLoader().validate_configuration(expanded_config)
+        
+        assert config["end_date"] == "2025-06-01"
+        assert config["duties"][-1]["date"] == "2025-06-01"
+        assert expanded_config["end_date"] == "2025-6-1"
+        assert expanded_config["duties"][-1]["date"] == "2025-6-1"
+        assert expanded_config["employees"][0]["off_days"] == ["2025-05-29", "2025-05-31", "2025-6-1"]
+    
+    @pytest.mark.parametrize("date_str, expected", [
+        ("2025-06-01", (2025, 6, 1)),
+        ("2025-6-1", (2025, 6, 1)),
+        ("2025-12-31", (2025, 12, 31)),
+    ])
+    def test_parse_date(self, date_str, expected):
+        """Test that padded and unpadded YYYY-M-D dates are parsed."""
+        parsed = ConfigLoader()._parse_date(date_str)
+        
+        assert (parsed.year, parsed.month, parsed.day) == expected
+    
+    @pytest.mark.parametrize("date_str", ["20250601", "2025-W22-7", "2025-06-01T00:00", "25-06-01", "2025-006-01", "2025-06-32"])
+    def test_parse_date_rejects_other_formats(self, date_str):
+        """Test that other ISO forms and invalid dates are rejected."""
+        with pytest.raises(ValueError):
+            ConfigLoader()._parse_date(date_str)
+    
+    def test_validate_configuration_invalid_off_day(self, expanded_config):
+        """Test that malformed off days are rejected."""
+        expanded_config["employees"][0]["off_days"] = ["2025-05-32"]
+        
+        with pytest.raises(ValueError, match="Invalid date format in off_days"):
+            ConfigLoader().validate_configuration(expanded_config)
+    
+    def test_validate_configuration_duty_outside_period(self, expanded_config):
+        """Test that duties outside the planning period are rejected."""
+        expanded_config["duties"][0]["date"] = "2025-06-02"
+        
+        with pytest.raises(ValueError, match="outside the configured period"):
+            ConfigLoader().validate_configuration(expanded_config)
+    
+    def test_load_configuration_by_name_returns_copies(self):
+        """Test that repeated loads of a configuration are independent."""
+        loader = ConfigLoader()
+        first = loader.load_configuration_by_name("test_l1")
+        first["duties"].clear()
+        second = loader.load_configuration_by_name("test_l1")
+        
+        assert second["duties"]
+        assert second["duties"][0]["id"] == 0
+    
+    def test_list_configurations(self, tmp_path):
+        """Test that only JSON files are listed, without their extension."""
+        (tmp_path / "first.json").write_text("{}")
+        (tmp_path / "second.json").write_text("{}")
+        (tmp_path / "notes.txt").write_text("")
+        (tmp_path / "folder.json").mkdir()
+        
+        assert sorted(ConfigLoader(str(tmp_path)).list_configurations()) == ["first", "second"]
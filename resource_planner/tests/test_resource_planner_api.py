@@ -0,0 +1,169 @@
+import pytest
+from resource_planner.src import json_utils
+from resource_planner.src.api import resource_planner_api
+from resource_planner.src.api.resource_planner_api import app
+from resource_planner.src.resource_planning_service import ResourcePlanningService
+
+
+@pytest.fixture(autouse=True)
+def clear_planner_cache():
+    """Start every test with an empty planner cache."""
+    ResourcePlanningService._planner_cache.clear()
+    yield
+    ResourcePlanningService._planner_cache.clear()
+
+
+@pytest.fixture
+def client():
+    """Flask test client for the API."""
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+class TestJSONProvider:
+    """Tests for serializing API responses."""
+
+    @pytest.mark.skipif(json_utils.orjson is None, reason="orjson is not installed")
+    def test_responses_use_orjson(self, client, monkeypatch):
+        """Test that jsonify responses are serialized by orjson."""
+        calls = []
+        dumps_canonical = json_utils.dumps_canonical
+        monkeypatch.setattr(
+            json_utils, "dumps_canonical",
+            lambda obj, default=None: calls.append(obj) or dumps_canonical(obj, default)
+        )
+
+        response = client.get("/api/resource-planner/configurations")
+
+        assert response.status_code == 200
+        assert calls == [response.get_json()]
+        assert response.data == dumps_canonical(response.get_json()) + b"\n"
+
+    def test_indented_output_uses_stdlib(self):
+        """Test that non-compact formatting is still supported."""
+        assert app.json.dumps({"b": 1, "a": [1]}, indent=2) == '{\n  "a": [\n    1\n  ],\n  "b": 1\n}'
+
+
+class TestSolveBatch:
+    """Tests for the /solve-batch endpoint."""
+
+    def test_results_in_request_order(self, client):
+        """Test that every configuration is solved, in the order of the request."""
+        response = client.post(
+            "/api/resource-planner/solve-batch",
+            json={"configs": [{"config_name": "test_l1"}, {"config_name": "test_l2"}]}
+        )
+
+        assert response.status_code == 200
+        assert [result["status"] for result in response.get_json()["results"]] == ["OPTIMAL", "INFEASIBLE"]
+
+    @pytest.mark.parametrize("body", [{"configs": {"config_name": "test_l1"}}, {}, []])
+    def test_configs_must_be_list(self, client, body):
+        """Test that a body without a list of configurations is rejected."""
+        response = client.post("/api/resource-planner/solve-batch", json=body)
+
+        assert response.status_code == 400
+
+    def test_bad_config_reported_per_entry(self, client):
+        """Test that a failing configuration gives an error entry without failing the batch."""
+        response = client.post(
+            "/api/resource-planner/solve-batch",
+            json={"configs": [{"config_name": "does_not_exist"}, {"config_name": "test_l1"}]}
+        )
+        results = response.get_json()["results"]
+
+        assert response.status_code == 200
+        assert "not found" in results[0]["error"]
+        assert results[1]["status"] == "OPTIMAL"
+
+    def test_non_object_entry_reported_per_entry(self, client):
+        """Test that an entry that is not a JSON object gives an error entry."""
+        response = client.post(
+            "/api/resource-planner/solve-batch",
+            json={"configs": ["config_name", ["test_l1"], {"config_name": "test_l1"}]}
+        )
+        results = response.get_json()["results"]
+
+        assert response.status_code == 200
+        assert results[0] == results[1] == {"error": "Configuration must be a JSON object"}
+        assert results[2]["status"] == "OPTIMAL"
+
+    def test_batch_size_limited(self, client):
+        """Test that a batch with more than MAX_BATCH_SIZE configurations is rejected."""
+        configs = [{"config_name": "test_l1"}] * (resource_planner_api.MAX_BATCH_SIZE + 1)
+        response = client.post("/api/resource-planner/solve-batch", json={"configs": configs})
+
+        assert response.status_code == 400
+
+
+class TestFieldProjection:
+    """Tests for the "fields" query parameter of /solve."""
+
+    def solve(self, client, query=""):
+        """Solve test_l1 through the API and return the assignments."""
+        response = client.post(f"/api/resource-planner/solve{query}", json={"config_name": "test_l1"})
+        assert response.status_code == 200
+        return response.get_json()["assignments"]
+
+    def test_empty_fields_keeps_everything(self, client):
+        """Test that an empty fields parameter returns the complete assignments."""
+        assert self.solve(client, "?fields=") == self.solve(client)
+
+    def test_unknown_fields_are_dropped(self, client):
+        """Test that unknown field names are ignored."""
+        assignments = self.solve(client, "?fields=date,no_such_field")
+
+        assert assignments
+        assert all(assignment.keys() == {"date"} for assignment in assignments)
+
+    def test_nested_employee_fields(self, client):
+        """Test that employee fields select the keys of the nested employees."""
+        assignments = self.solve(client, "?fields=duty_code,%20employee_name")
+
+        assert all(assignment.keys() == {"duty_code", "employees"} for assignment in assignments)
+        assert all(
+            employee.keys() == {"employee_name"}
+            for assignment in assignments
+            for employee in assignment["employees"]
+        )
+
+
+class TestConfigurationsETag:
+    """Tests for conditional requests to /configurations."""
+
+    def test_matching_etag_not_modified(self, client):
+        """Test that a request with the current ETag gets a 304 without a body."""
+        etag = client.get("/api/resource-planner/configurations").headers["ETag"]
+
+        response = client.get("/api/resource-planner/configurations", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_changed_configurations_modified(self, client, monkeypatch):
+        """Test that the old ETag no longer matches once the configurations change."""
+        etag = client.get("/api/resource-planner/configurations").headers["ETag"]
+        configs = ResourcePlanningService.list_available_configurations()
+        monkeypatch.setattr(
+            ResourcePlanningService, "list_available_configurations",
+            classmethod(lambda cls: configs + ["new_config"])
+        )
+
+        response = client.get("/api/resource-planner/configurations", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert "new_config" in response.get_json()["configurations"]
+        assert response.headers["ETag"] != etag
+
+
+class TestRequestBody:
+    """Tests for rejecting request bodies that are not JSON objects."""
+
+    @pytest.mark.parametrize("endpoint", ["solve", "validate-config"])
+    @pytest.mark.parametrize("body", [[], "x", [{"config_name": "test_l1"}]])
+    def test_non_object_body(self, client, endpoint, body):
+        """Test that a JSON body that is not an object gets a 400."""
+        response = client.post(f"/api/resource-planner/{endpoint}", json=body)
+
+        assert response.status_code == 400
+        assert "error" in response.get_json()
@@ -0,0 +1,368 @@
+import functools
+import threading
+import pytest
+from ortools.sat.python import cp_model
+from resource_planner.src import ResourcePlanningService
+from resource_planner.src import resource_planner
+from resource_planner.src import resource_planning_service
+from resource_planner.src.constraints import RequiredEmployeesConstraint
+from resource_planner.src.resource_planner import SolverStatus
+
+
+@pytest.fixture(autouse=True)
+def clear_planner_cache():
+    """Start every test with an empty planner cache."""
+    ResourcePlanningService._planner_cache.clear()
+    yield
+    ResourcePlanningService._planner_cache.clear()
+
+
+class TestPlannerCache:
+    """Tests for reusing set up planners between service instances."""
+
+    def test_same_config_reuses_model(self):
+        """Test that services for the same configuration share the built model."""
+        first = ResourcePlanningService("test_l1")
+        second = ResourcePlanningService("test_l1")
+
+        assert second.planner is not first.planner
+        assert second.planner.model is first.planner.model
+        assert second.planner.constraints is first.planner.constraints
+
+    def test_cached_planner_solves_independently(self):
+        """Test that a cached planner keeps its own results."""
+        first = ResourcePlanningService("test_l1")
+        result = first.solve()
+        second = ResourcePlanningService("test_l1")
+
+        assert second.planner.result_assignments == []
+        assert second.solve()["assignments"] == result["assignments"]
+        assert first.planner.result_assignments == result["assignments"]
+
+    def test_config_normalized_on_cache_hit(self):
+        """Test that services for the same input get the same normalized configuration."""
+        config = dict(ResourcePlanningService("test_l1").config, start_date="2025-5-1")
+        first = ResourcePlanningService(config)
+        second = ResourcePlanningService(config)
+
+        assert second.planner.model is first.planner.model
+        assert first.config == second.config
+        assert second.config["start_date"] == "2025-05-01"
+        assert config["start_date"] == "2025-5-1"
+
+    def test_cached_planner_is_frozen(self):
+        """Test that the shared planner state cannot be changed through a service."""
+        planner = ResourcePlanningService("test_l1").planner
+
+        assert isinstance(planner.employees, tuple)
+        assert isinstance(planner.constraints, tuple)
+        with pytest.raises(TypeError):
+            planner.solver_assignments[0, 0] = None
+        with pytest.raises(TypeError):
+            planner.duties[0]["date"] = "2025-01-01"
+        with pytest.raises(TypeError):
+            planner.constraints[0].employees[0]["max_hours_in_period"] = 0
+        with pytest.raises(RuntimeError):
+            planner.add_duty(99, "X", "2025-05-01", 1, "04:00", "13:00", 540)
+
+    def test_concurrent_solves_share_read_only_state(self):
+        """Test that concurrent services for one configuration solve independently and leave the shared model unchanged."""
+        # A single worker makes the solutions deterministic
+        planner = ResourcePlanningService("test_max_work_time").planner
+        planner.solve({"workers": 1})
+        expected = planner.result_assignments
+        services = [ResourcePlanningService("test_max_work_time") for _ in range(4)]
+        model_before = str(services[0].planner.model.Proto())
+        results = {}
+
+        def solve_and_validate(index, service):
+            service.planner.solve({"workers": 1})
+            results[index] = (service.planner.result_assignments, service.planner.validate_solution())
+
+        threads = [
+            threading.Thread(target=solve_and_validate, args=(index, service))
+            for index, service in enumerate(services)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert str(services[0].planner.model.Proto()) == model_before
+        for index, service in enumerate(services):
+            assignments, validation = results[index]
+            assert assignments is service.planner.result_assignments
+            assert assignments == expected
+            assert all(validation.values())
+
+    def test_different_configs_get_different_models(self):
+        """Test that a changed configuration is set up again."""
+        first = ResourcePlanningService("test_l1")
+        config = dict(first.config, name="changed")
+        second = ResourcePlanningService(config)
+
+        assert second.planner.model is not first.planner.model
+        assert second.planner.solve() == SolverStatus.OPTIMAL
+
+    def test_cache_size_is_bounded(self, monkeypatch):
+        """Test that the least recently used planners are dropped."""
+        monkeypatch.setattr(ResourcePlanningService, "PLANNER_CACHE_SIZE", 1)
+        first = ResourcePlanningService("test_l1")
+        ResourcePlanningService("test_max_work_time")
+        third = ResourcePlanningService("test_l1")
+
+        assert len(ResourcePlanningService._planner_cache) == 1
+        assert third.planner.model is not first.planner.model
+
+
+class TestDirectConfig:
+    """Tests for services created from a configuration dictionary."""
+
+    def test_unpadded_dates(self):
+        """Test that a configuration with dates like 2025-5-1 is solved."""
+        config = ResourcePlanningService("test_l1").config
+        unpadded = lambda date: "-".join(str(int(part)) for part in date.split("-"))
+        config = {
+            **config,
+            "start_date": unpadded(config["start_date"]),
+            "duties": [{**duty, "date": unpadded(duty["date"])} for duty in config["duties"]],
+        }
+
+        assert ResourcePlanningService(config).solve()["status"] == "OPTIMAL"
+
+
+class TestValidateSolution:
+    """Tests for validating a solved plan against all constraints."""
+
+    def test_results_in_constraint_order(self):
+        """Test that every constraint is reported, in the order it was added."""
+        service = ResourcePlanningService("test_l1")
+        service.solve()
+
+        results = service.planner.validate_solution()
+
+        assert list(results) == [
+            constraint.__class__.__name__ for constraint in service.planner.constraints
+        ]
+        assert all(results.values())
+
+
+class TestSharedIndexes:
+    """Tests for indexes the planner shares with its constraints."""
+
+    def test_duties_by_date_shared(self):
+        """Test that all constraints use the planner's duties-by-date index."""
+        planner = ResourcePlanningService("test_l1").planner
+
+        assert sum(len(duties) for duties in planner.duties_by_date.values()) == len(planner.duties)
+        assert all(
+            constraint.duties_by_date is planner.duties_by_date
+            for constraint in planner.constraints
+        )
+
+    def test_day_work_created_on_demand(self):
+        """Test that daily work variables only exist when a constraint uses them."""
+        planner = ResourcePlanningService("test_l1").planner
+        dates = {duty["date"] for duty in planner.duties}
+        assert len(planner.day_work) == len(planner.employees) * len(dates)
+
+        planner = resource_planner.ResourcePlanner()
+        planner.add_employee(0, "Anna Schmidt", 6, [], 8, 40)
+        planner.add_duty(0, "DIS", "2025-05-01", 1, "04:00", "13:00", 540)
+        planner.add_constraint(RequiredEmployeesConstraint)
+        planner.setup_model()
+        assert planner.day_work == {}
+
+
+class TestFixedAssignments:
+    """Tests for assignments fixed to 0 by constraints."""
+
+    def test_blocked_days_use_constant(self):
+        """Test that assignments on blocked days are the planner's constant 0."""
+        planner = ResourcePlanningService("test_l1").planner
+        blocked = {
+            (emp["id"], duty["id"])
+            for emp in planner.employees
+            for duty in planner.duties
+            if duty["date"] in emp["blocked_days"]
+        }
+
+        assert blocked
+        assert all(
+            (var is planner.fixed_zero) == (pair in blocked)
+            for pair, var in planner.solver_assignments.items()
+        )
+
+
+class TestEmployeeSymmetry:
+    """Tests for ordering the schedules of interchangeable employees."""
+
+    def test_interchangeable_schedules_ordered(self):
+        """Test that identical employees get lexicographically ordered schedules."""
+        service = ResourcePlanningService("test_max_work_time")
+        result = service.solve()
+        planner = service.planner
+
+        assigned = {
+            (employee["employee_id"], assignment["duty_id"])
+            for assignment in result["assignments"]
+            for employee in assignment["employees"]
+        }
+        schedules = [
+            [int((emp["id"], duty["id"]) in assigned) for duty in planner.duties]
+            for emp in planner.employees
+        ]
+
+        assert result["status"] == "OPTIMAL"
+        assert schedules == sorted(schedules, reverse=True)
+
+    def build_service(self, monkeypatch, config, break_symmetry):
+        """Build a service whose planner breaks symmetry or not, bypassing the cache."""
+        ResourcePlanningService._planner_cache.clear()
+        monkeypatch.setattr(
+            resource_planning_service, "ResourcePlanner",
+            functools.partial(resource_planner.ResourcePlanner, break_symmetry=break_symmetry)
+        )
+        service = ResourcePlanningService(config)
+        assert service.planner.break_symmetry is break_symmetry
+        return service
+
+    def test_groups_by_fields_the_constraints_read(self, monkeypatch):
+        """Test that a field no constraint reads does not split a group."""
+        config = ResourcePlanningService("test_max_work_time").config
+        config["employees"][0]["max_hours_per_day"] = 10
+        num_constraints = {
+            break_symmetry: len(self.build_service(monkeypatch, config, break_symmetry).planner.model.Proto().constraints)
+            for break_symmetry in (False, True)
+        }
+
+        # 4 employees in one group give 3 ordered pairs of 3 clauses per duty, less the last 2
+        num_duties = len(config["duties"])
+        assert num_constraints[True] - num_constraints[False] == 3 * (3 * num_duties - 2)
+
+    @pytest.mark.parametrize("config_name", ["test_l1", "test_max_work_time", "test_max_work_time2"])
+    def test_same_objective_without_symmetry_breaking(self, monkeypatch, config_name):
+        """Test that symmetry breaking does not change the optimal objective value."""
+        objective_values = []
+        for break_symmetry in (True, False):
+            service = self.build_service(monkeypatch, config_name, break_symmetry)
+            assert service.solve({"workers": 1})["status"] == "OPTIMAL"
+            objective_values.append(service.planner.objective_value)
+
+        assert objective_values[0] is not None
+        assert objective_values[0] == objective_values[1]
+
+
+class TestSolveOptions:
+    """Tests for passing solve options to the CP-SAT solver."""
+
+    def test_defaults(self):
+        """Test that the solver uses the default parameters without options."""
+        solver = ResourcePlanningService("test_l1").planner.create_solver()
+
+        assert solver.parameters.max_time_in_seconds == 300.0
+        assert solver.parameters.num_search_workers == resource_planner.NUM_SEARCH_WORKERS
+
+    def test_options_override_defaults(self, monkeypatch):
+        """Test that options are mapped to solver parameters."""
+        monkeypatch.setattr(resource_planner, "MAX_SEARCH_WORKERS", 4)
+        solver = ResourcePlanningService("test_l1").planner.create_solver(
+            {"time_limit": 5, "workers": 2, "relative_gap_limit": 0.05}
+        )
+
+        assert solver.parameters.max_time_in_seconds == 5.0
+        assert solver.parameters.num_search_workers == 2
+        assert solver.parameters.relative_gap_limit == pytest.approx(0.05)
+
+    def test_unknown_option(self):
+        """Test that an unknown option is rejected."""
+        with pytest.raises(ValueError):
+            ResourcePlanningService("test_l1").planner.create_solver({"threads": 2})
+
+    @pytest.mark.parametrize("options", [
+        {"time_limit": 0},
+        {"time_limit": "5"},
+        {"workers": 0},
+        {"workers": 1.5},
+        {"log": 1},
+        {"linearization_level": 3},
+        {"relative_gap_limit": -0.1},
+    ])
+    def test_invalid_option_value(self, options):
+        """Test that option values of the wrong type or out of range are rejected."""
+        with pytest.raises(ValueError):
+            ResourcePlanningService("test_l1").planner.create_solver(options)
+
+    def test_limits_capped(self, monkeypatch):
+        """Test that time_limit and workers are capped."""
+        monkeypatch.setattr(resource_planner, "MAX_SEARCH_WORKERS", 4)
+        solver = ResourcePlanningService("test_l1").planner.create_solver({"time_limit": 10_000, "workers": 10_000})
+
+        assert solver.parameters.max_time_in_seconds == resource_planner.MAX_TIME_LIMIT_SECONDS
+        assert solver.parameters.num_search_workers == 4
+
+    def test_service_options(self):
+        """Test that the service passes options from its caller to the solver."""
+        assert ResourcePlanningService("test_l1").solve({"workers": 1})["status"] == "OPTIMAL"
+
+    def test_config_solver_options_ignored(self, monkeypatch):
+        """Test that solver_options in the configuration are not used and don't split the cache."""
+        service = ResourcePlanningService("test_l1")
+        config = dict(service.config, solver_options={"time_limit": 10_000, "workers": 10_000})
+        requested = []
+        monkeypatch.setattr(resource_planner.ResourcePlanner, "solve", lambda planner, options=None: (
+            requested.append(options) or SolverStatus.INFEASIBLE
+        ))
+
+        other = ResourcePlanningService(config)
+        other.solve()
+
+        assert other.planner.model is service.planner.model
+        assert requested == [None]
+
+
+class TestSolverSlots:
+    """Tests for sharing the CPU cores between concurrent solves."""
+
+    def test_overlapping_solves(self, monkeypatch):
+        """Test that two solves whose workers fit the budget run at the same time."""
+        monkeypatch.setattr(resource_planner, "_solver_slots", resource_planner._SolverSlots(2))
+        both_solving = threading.Barrier(2, timeout=10)
+        solve = cp_model.CpSolver.Solve
+
+        def solve_when_both_started(solver, model, *args, **kwargs):
+            # Breaks with BrokenBarrierError if the solves are serialized
+            both_solving.wait()
+            return solve(solver, model, *args, **kwargs)
+
+        monkeypatch.setattr(cp_model.CpSolver, "Solve", solve_when_both_started)
+        planners = [ResourcePlanningService("test_l1").planner for _ in range(2)]
+        statuses = []
+        threads = [
+            threading.Thread(target=lambda planner=planner: statuses.append(planner.solve({"workers": 1})))
+            for planner in planners
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert statuses == [SolverStatus.OPTIMAL, SolverStatus.OPTIMAL]
+
+    def test_solve_waits_for_enough_slots(self):
+        """Test that a solve needing more slots than are free waits for them."""
+        slots = resource_planner._SolverSlots(2)
+        reserved = threading.Event()
+
+        def reserve_all():
+            with slots.reserve(8):
+                reserved.set()
+
+        with slots.reserve(1):
+            thread = threading.Thread(target=reserve_all)
+            thread.start()
+            assert not reserved.wait(0.1)
+        thread.join(timeout=10)
+
+        assert reserved.is_set()
+        assert slots.available == 2